@@ -8,11 +8,14 @@ then export the modified JSON for downstream use.
 Built on top of the Marker document conversion library.
 """
 
+import hashlib
 import json
 import logging
 import os
+import shutil
 import sys
 import tempfile
+from concurrent.futures import Future, ThreadPoolExecutor
 
 # Configure terminal logging
 logging.basicConfig(
@@ -25,25 +28,27 @@ logger = logging.getLogger(__name__)
 os.environ["PYTORCH_ENABLE_MPS_FALLBACK"] = "1"
 os.environ["IN_STREAMLIT"] = "true"
 
+import orjson
 import streamlit as st
 from PIL import Image
+from pydantic_core import to_json
 from streamlit_ace import st_ace
 
 from converter.schema import BaselineDocument
 from styles import (
     CUSTOM_CSS,
-    get_block_color,
     render_block_badge,
     render_metric_card,
-    render_property_chips,
 )
 from utils import (
+    build_block_chrome,
+    build_block_index,
     build_export_json,
-    count_editable_fields,
+    count_pages,
+    document_stats,
     flatten_blocks,
     get_block_icon,
-    get_page_count,
-    get_page_image,
+    render_page_jpeg,
 )
 
 # ────────────────────────────────────────────────────────────
@@ -63,19 +68,169 @@ st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
 # ────────────────────────────────────────────────────────────
 # Session State Initialization
 # ────────────────────────────────────────────────────────────
+if "doc_obj" not in st.session_state:
+    st.session_state.doc_obj = None
+if "block_index" not in st.session_state:
+    st.session_state.block_index = {}
+if "block_chrome" not in st.session_state:
+    st.session_state.block_chrome = []
+if "doc_stats" not in st.session_state:
+    st.session_state.doc_stats = None
 if "synced_json_str" not in st.session_state:
     st.session_state.synced_json_str = None
+if "doc_revision" not in st.session_state:
+    st.session_state.doc_revision = 0
 if "original_pdf_bytes" not in st.session_state:
     st.session_state.original_pdf_bytes = None
 if "conversion_done" not in st.session_state:
     st.session_state.conversion_done = False
 if "uploaded_file_bytes" not in st.session_state:
     st.session_state.uploaded_file_bytes = None
+if "uploaded_file_id" not in st.session_state:
+    st.session_state.uploaded_file_id = None
+if "uploaded_file_hash" not in st.session_state:
+    st.session_state.uploaded_file_hash = None
+if "total_pages" not in st.session_state:
+    st.session_state.total_pages = 1
+if "page_image_cache" not in st.session_state:
+    st.session_state.page_image_cache = {}
+
+# Uploads above this size are copied to the temp dir in chunks
+LARGE_UPLOAD_BYTES = 50 * 1024 * 1024
+# Serialized documents above this many characters open the code editor on request
+LARGE_EDITOR_CHARS = 1_000_000
+# Rendered preview pages kept per session (current page plus prefetched neighbours)
+PREVIEW_CACHE_SIZE = 8
+
+
+# ────────────────────────────────────────────────────────────
+# Document State Helpers
+# ────────────────────────────────────────────────────────────
+def _set_document(new_doc: BaselineDocument):
+    """Install a freshly converted/validated document as the Single Source of Truth."""
+    st.session_state.doc_obj = new_doc
+    st.session_state.block_index = build_block_index(new_doc)
+    st.session_state.block_chrome = build_block_chrome(new_doc)
+    st.session_state.doc_stats = document_stats(new_doc)
+    st.session_state.synced_json_str = None
+    st.session_state.doc_revision += 1
+
+
+def _synced_json() -> str:
+    """Return the compact JSON for the current document, re-serializing only after edits."""
+    if st.session_state.synced_json_str is None:
+        st.session_state.synced_json_str = st.session_state.doc_obj.model_dump_json(exclude_none=True)
+    return st.session_state.synced_json_str
+
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def _pretty_json(json_str: str) -> str:
+    """Indented view of the compact SSOT, built only for the code editor."""
+    try:
+        return orjson.dumps(orjson.loads(json_str), option=orjson.OPT_INDENT_2).decode()
+    except orjson.JSONDecodeError:
+        # orjson rejects the NaN/Infinity constants the schema may serialize
+        return json.dumps(json.loads(json_str), indent=2, ensure_ascii=False)
+
+
+# Exporters are memoized on the SSOT JSON string: the leading-underscore
+# document argument is not hashed, it is simply the object that string was
+# serialized from, so nothing has to be re-parsed on a cache miss.
+@st.cache_data(show_spinner=False, max_entries=2)
+def _cached_edited_pdf(json_str: str, pdf_bytes: bytes, _doc: BaselineDocument):
+    from converter.pdf_exporter import export_edited_pdf
+    return export_edited_pdf(pdf_bytes, _doc)
+
+
+@st.cache_data(show_spinner=False, max_entries=2)
+def _cached_edited_html(json_str: str, _doc: BaselineDocument):
+    from converter.html_exporter import export_edited_html
+    return export_edited_html(_doc)
+
+
+@st.cache_data(show_spinner=False, max_entries=2)
+def _cached_edited_docx(json_str: str, _doc: BaselineDocument):
+    from converter.docx_exporter import export_edited_docx
+    return export_edited_docx(_doc)
+
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def _page_count(file_hash: str, file_type: str, _file_bytes: bytes) -> int:
+    """Page count of an upload, keyed by its content hash rather than its bytes."""
+    return count_pages(_file_bytes, file_type, file_hash)
+
+
+@st.cache_resource(show_spinner=False)
+def _preview_executor() -> ThreadPoolExecutor:
+    """The preview render thread, shared by every session in the process.
+
+    Renders are serialized on the PDFium lock anyway, so one thread serves
+    all sessions and none is left behind when a session ends.
+    """
+    return ThreadPoolExecutor(max_workers=1, thread_name_prefix="page-preview")
+
+
+def _page_image(file_type: str, page_num: int, max_width_px: int) -> Future:
+    """Return a Future for a rendered preview page (JPEG bytes), scheduling the render if needed.
+
+    Renders run on the shared preview thread (see _preview_executor) and are
+    cached per session (as futures, so in-flight prefetches are reused) keyed
+    by upload hash, page and render width, with least-recently-used eviction.
+    """
+    cache = st.session_state.page_image_cache
+    key = (st.session_state.uploaded_file_hash, page_num, max_width_px)
+    future = cache.pop(key, None)
+    if future is None:
+        future = _preview_executor().submit(
+            render_page_jpeg,
+            st.session_state.uploaded_file_bytes,
+            file_type,
+            page_num,
+            max_width_px=max_width_px,
+            file_hash=st.session_state.uploaded_file_hash,
+        )
+    cache[key] = future  # (re)insert as most recently used
+    while len(cache) > PREVIEW_CACHE_SIZE:
+        cache.pop(next(iter(cache)))
+    return future
+
+
+@st.cache_resource(show_spinner=False)
+def _schema_validator():
+    """Compile the BaselineDocument JSON Schema once per process for code-editor syncs."""
+    import fastjsonschema
+
+    return fastjsonschema.compile(BaselineDocument.model_json_schema())
+
+
+def _flush_html(parts: list) -> None:
+    """Emit buffered read-only HTML as a single markdown element and reset the buffer."""
+    if parts:
+        st.markdown("".join(parts), unsafe_allow_html=True)
+        parts.clear()
+
+
+def _deferred_export(build, error_message: str):
+    """Wrap an exporter for st.download_button's deferred ``data``.
+
+    The exporters return None on failure; raising makes the download fail
+    with a message instead of serving an empty file.
+    """
+    def _generate():
+        data = build()
+        if not data:
+            raise RuntimeError(error_message)
+        return data
+
+    return _generate
 
 
 # ────────────────────────────────────────────────────────────
 # Sidebar
 # ────────────────────────────────────────────────────────────
+# One document object shared by the sidebar export, metrics, preview and editor
+doc = st.session_state.doc_obj
+
 with st.sidebar:
     st.markdown('<div class="hero-title">🔬 Baseline JSON</div>', unsafe_allow_html=True)
     st.markdown('<div class="hero-subtitle">Document → Structured Schema Editor</div>', unsafe_allow_html=True)
@@ -88,8 +243,16 @@ with st.sidebar:
         label_visibility="collapsed",
     )
 
-    if in_file is not None:
+    # Copy the upload out of the widget once per file, not on every rerun
+    if in_file is not None and st.session_state.uploaded_file_id != in_file.file_id:
         st.session_state.uploaded_file_bytes = in_file.getvalue()
+        st.session_state.uploaded_file_id = in_file.file_id
+        st.session_state.uploaded_file_hash = hashlib.blake2b(
+            st.session_state.uploaded_file_bytes, digest_size=16
+        ).hexdigest()
+        st.session_state.total_pages = _page_count(
+            st.session_state.uploaded_file_hash, in_file.type, st.session_state.uploaded_file_bytes
+        )
 
     st.markdown('<div class="gradient-divider"></div>', unsafe_allow_html=True)
 
@@ -115,6 +278,28 @@ with st.sidebar:
         # API takes over, these settings aren't relevant
         force_ocr = False
         use_llm = False
+        from converter.fast_api_converter import DEFAULT_API_WORKERS
+
+        max_workers = st.slider(
+            "API concurrency",
+            min_value=1,
+            max_value=64,
+            value=DEFAULT_API_WORKERS,
+            help="Pages sent to the Vision API at once. Lower it if you hit provider rate limits.",
+        )
+        use_vision_cache = not st.checkbox(
+            "♻️ Re-extract (ignore cache)",
+            value=False,
+            help="Send every page to the Vision API again instead of reusing earlier extractions of the same page.",
+        )
+
+    preview_width = st.select_slider(
+        "Preview quality",
+        options=[600, 900, 1200, 1600, 2000],
+        value=900,
+        format_func=lambda px: f"{px}px",
+        help="Width pages are rendered at in the Document Preview tab. Higher is sharper when zooming but slower.",
+    )
 
     st.markdown('<div class="gradient-divider"></div>', unsafe_allow_html=True)
 
@@ -129,79 +314,76 @@ with st.sidebar:
             st.success("✅ Models loaded! Conversions will be fast now.")
 
     # Export section
-    if st.session_state.synced_json_str is not None:
+    if doc is not None:
         st.markdown('<div class="gradient-divider"></div>', unsafe_allow_html=True)
         st.markdown("### 📥 Export")
 
-        # Parse to get filename safely
-        temp_doc = BaselineDocument.model_validate_json(st.session_state.synced_json_str)
+        pdf_bytes = st.session_state.original_pdf_bytes
+        base_name = doc.filename.rsplit('.', 1)[0]
 
+        # Every payload is a callable evaluated on click against the live
+        # document: nothing is built (or imported) until the user asks for that
+        # one file, and schema-editor fragment reruns, which never redraw the
+        # sidebar, cannot leave a stale payload behind.
         st.download_button(
             label="⬇️ Download Baseline JSON",
-            data=st.session_state.synced_json_str,
-            file_name=f"{temp_doc.filename.rsplit('.', 1)[0]}_baseline.json",
+            data=lambda: doc.model_dump_json(indent=2, exclude_none=True),
+            file_name=f"{base_name}_baseline.json",
             mime="application/json",
+            on_click="ignore",
             use_container_width=True,
         )
 
         from utils import clear_document_content
-        empty_doc = clear_document_content(temp_doc)
-        
+
         st.download_button(
             label="🈳 Download Empty Schema",
-            data=empty_doc.model_dump_json(indent=2),
-            file_name=f"{temp_doc.filename.rsplit('.', 1)[0]}_template.json",
+            data=lambda: clear_document_content(doc).model_dump_json(indent=2),
+            file_name=f"{base_name}_template.json",
             mime="application/json",
+            on_click="ignore",
             use_container_width=True,
         )
 
         # Also offer the Edited PDF if the original file was a PDF
-        if st.session_state.original_pdf_bytes is not None:
-            # Rebuild the edited PDF on the fly using PyMuPDF
-            from converter.pdf_exporter import export_edited_pdf
-            
-            with st.spinner("Generating Edited PDF overlay..."):
-                edited_pdf_bytes = export_edited_pdf(
-                    st.session_state.original_pdf_bytes, 
-                    temp_doc
-                )
-                
-            if edited_pdf_bytes:
-                st.download_button(
-                    label="📄 Download Edited PDF",
-                    data=edited_pdf_bytes,
-                    file_name=f"{temp_doc.filename.rsplit('.', 1)[0]}_edited.pdf",
-                    mime="application/pdf",
-                    use_container_width=True,
-                )
-            else:
-                st.error("❌ Failed to generate edited PDF.")
-                
-        # Optional HTML Export
-        from converter.html_exporter import export_edited_html
-        with st.spinner("Generating HTML..."):
-            edited_html_str = export_edited_html(temp_doc)
-        if edited_html_str:
+        if pdf_bytes is not None:
             st.download_button(
-                label="🌐 Download Edited HTML",
-                data=edited_html_str,
-                file_name=f"{temp_doc.filename.rsplit('.', 1)[0]}_edited.html",
-                mime="text/html",
+                label="📄 Download Edited PDF",
+                data=_deferred_export(
+                    lambda: _cached_edited_pdf(doc.model_dump_json(exclude_none=True), pdf_bytes, doc),
+                    "Failed to generate edited PDF.",
+                ),
+                file_name=f"{base_name}_edited.pdf",
+                mime="application/pdf",
+                on_click="ignore",
                 use_container_width=True,
             )
-            
+
+        # Optional HTML Export
+        st.download_button(
+            label="🌐 Download Edited HTML",
+            data=_deferred_export(
+                lambda: _cached_edited_html(doc.model_dump_json(exclude_none=True), doc),
+                "Failed to generate edited HTML.",
+            ),
+            file_name=f"{base_name}_edited.html",
+            mime="text/html",
+            on_click="ignore",
+            use_container_width=True,
+        )
+
         # Optional DOCX Export
-        from converter.docx_exporter import export_edited_docx
-        with st.spinner("Generating DOCX..."):
-            edited_docx_bytes = export_edited_docx(temp_doc)
-        if edited_docx_bytes:
-            st.download_button(
-                label="📘 Download Edited DOCX",
-                data=edited_docx_bytes,
-                file_name=f"{temp_doc.filename.rsplit('.', 1)[0]}_edited.docx",
-                mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-                use_container_width=True,
-            )
+        st.download_button(
+            label="📘 Download Edited DOCX",
+            data=_deferred_export(
+                lambda: _cached_edited_docx(doc.model_dump_json(exclude_none=True), doc),
+                "Failed to generate edited DOCX.",
+            ),
+            file_name=f"{base_name}_edited.docx",
+            mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+            on_click="ignore",
+            use_container_width=True,
+        )
     st.markdown('<div class="gradient-divider"></div>', unsafe_allow_html=True)
     st.markdown(
         '<div style="text-align:center; font-size:0.7rem; color:#6C6C80; margin-top:1rem;">'
@@ -228,11 +410,10 @@ if convert_btn and in_file is not None:
     try:
         logger.info(f"Starting {engine_choice} conversion for uploaded file: {in_file.name} (Size: {in_file.size} bytes)")
         
+        # Bytes were read once when the file was uploaded; reuse them
+        file_bytes = st.session_state.uploaded_file_bytes
         if in_file.type == "application/pdf":
-            file_bytes = in_file.read()
             st.session_state.original_pdf_bytes = file_bytes
-            # reset pointer for downstream readers
-            in_file.seek(0)
         else:
             st.session_state.original_pdf_bytes = None
 
@@ -240,7 +421,12 @@ if convert_btn and in_file is not None:
             ext = os.path.splitext(in_file.name)[1]
             temp_path = os.path.join(tmp_dir, f"input{ext}")
             with open(temp_path, "wb") as f:
-                f.write(in_file.getvalue())
+                if len(file_bytes) > LARGE_UPLOAD_BYTES:
+                    # Stream big uploads to disk in 1 MiB chunks
+                    in_file.seek(0)
+                    shutil.copyfileobj(in_file, f, length=1 << 20)
+                else:
+                    f.write(file_bytes)
 
             logger.info(f"Saved temp file to {temp_path}. Routing to selected converter...")
             
@@ -259,6 +445,8 @@ if convert_btn and in_file is not None:
                     filepath=temp_path,
                     page_range=page_range if page_range.strip() else None,
                     progress_callback=_update_progress,
+                    max_workers=max_workers,
+                    use_cache=use_vision_cache,
                 )
             else:
                 from converter.pdf_to_baseline import convert_document_to_baseline
@@ -273,7 +461,7 @@ if convert_btn and in_file is not None:
         logger.info(f"Conversion complete! Processed {len(baseline_doc.pages)} pages.")
         
         # Single Source of Truth
-        st.session_state.synced_json_str = baseline_doc.model_dump_json(indent=2, exclude_none=True)
+        _set_document(baseline_doc)
         st.session_state.conversion_done = True
         progress_bar.empty()
         status_text.empty()
@@ -300,7 +488,7 @@ st.markdown(
     unsafe_allow_html=True,
 )
 
-if st.session_state.synced_json_str is None:
+if doc is None:
     # Landing state
     st.markdown('<div class="gradient-divider"></div>', unsafe_allow_html=True)
 
@@ -360,12 +548,6 @@ if st.session_state.synced_json_str is None:
 # ────────────────────────────────────────────────────────────
 # Document loaded — show success + metrics
 # ────────────────────────────────────────────────────────────
-try:
-    doc = BaselineDocument.model_validate_json(st.session_state.synced_json_str)
-except Exception as e:
-    st.error(f"Internal Error: Failed to parse SSOT JSON state: {e}")
-    st.stop()
-
 if st.session_state.conversion_done:
     st.markdown(
         '<div class="success-banner">'
@@ -377,14 +559,15 @@ if st.session_state.conversion_done:
     st.session_state.conversion_done = False
 
 # Metrics row
-total_blocks = sum(doc.metadata.block_type_counts.values())
-editable_fields = count_editable_fields(doc)
+stats = st.session_state.doc_stats
+if stats is None:
+    stats = st.session_state.doc_stats = document_stats(doc)
 
 metrics_html = '<div class="metric-row">'
 metrics_html += render_metric_card(str(doc.metadata.total_pages), "Pages", "#6C5CE7")
-metrics_html += render_metric_card(str(total_blocks), "Blocks", "#00B894")
-metrics_html += render_metric_card(str(editable_fields), "Editable Fields", "#0984E3")
-metrics_html += render_metric_card(str(len(doc.metadata.block_type_counts)), "Block Types", "#F39C12")
+metrics_html += render_metric_card(str(stats.total_blocks), "Blocks", "#00B894")
+metrics_html += render_metric_card(str(stats.editable_fields), "Editable Fields", "#0984E3")
+metrics_html += render_metric_card(str(stats.block_types), "Block Types", "#F39C12")
 metrics_html += "</div>"
 st.markdown(metrics_html, unsafe_allow_html=True)
 
@@ -392,28 +575,115 @@ st.markdown(metrics_html, unsafe_allow_html=True)
 # ────────────────────────────────────────────────────────────
 # Callbacks for SSOT Sync
 # ────────────────────────────────────────────────────────────
+def _patch_synced_json(old_fragment: str, new_fragment: str, prefix: bool = False) -> None:
+    """Splice an edit into the cached compact JSON instead of re-serializing it.
+
+    The fragment must occur exactly once (or, with ``prefix``, open the
+    string); otherwise the cache is dropped and _synced_json() rebuilds it.
+    """
+    json_str = st.session_state.synced_json_str
+    if json_str is None:
+        return
+    if json_str.startswith(old_fragment) if prefix else json_str.count(old_fragment) == 1:
+        st.session_state.synced_json_str = json_str.replace(old_fragment, new_fragment, 1)
+    else:
+        st.session_state.synced_json_str = None
+
+
 def update_doc_state(block_id: str, widget_key: str):
-    """Callback to update the centralized JSON string when a text input changes."""
+    """Callback to apply a text input change to the in-memory document."""
     new_val = st.session_state[widget_key]
-    current_doc = BaselineDocument.model_validate_json(st.session_state.synced_json_str)
-    
+
+    # Fragments are built with the same serializer as model_dump_json, so they
+    # match the cached string byte for byte; field order is the schema's.
     if block_id == "__title__":
-        current_doc.title = new_val
+        doc = st.session_state.doc_obj
+        _patch_synced_json(
+            '{"title":' + to_json(doc.title).decode(),
+            '{"title":' + to_json(new_val).decode(),
+            prefix=True,
+        )
+        doc.title = new_val
     else:
-        for page in current_doc.pages:
-            def update_blocks(blocks):
-                for b in blocks:
-                    if b.id == block_id:
-                        b.content = new_val
-                        return True
-                    if b.children and update_blocks(b.children):
-                        return True
-                return False
-            if update_blocks(page.blocks):
-                break
-                
-    # Save back to Single Source of Truth
-    st.session_state.synced_json_str = current_doc.model_dump_json(indent=2, exclude_none=True)
+        block = st.session_state.block_index.get(block_id)
+        if block is None:
+            return
+        # Keep the editable-field count in step without re-walking the tree
+        st.session_state.doc_stats.editable_fields += bool(new_val) - bool(block.content)
+        anchor = '"id":' + to_json(block.id).decode() + ',"block_type":' + to_json(block.block_type).decode()
+        _patch_synced_json(
+            anchor + ',"content":' + to_json(block.content).decode(),
+            anchor + ',"content":' + to_json(new_val).decode(),
+        )
+        block.content = new_val
+
+    st.session_state.doc_revision += 1
+
+
+# ────────────────────────────────────────────────────────────
+# Schema Editor Page Fragment
+# ────────────────────────────────────────────────────────────
+@st.fragment
+def render_page_editor(page, page_chrome):
+    """Render one page of the schema editor.
+
+    Runs as a fragment, so an edit in this page's widgets reruns only this
+    page rather than the whole app. Read-only HTML is buffered and emitted in
+    one st.markdown call right before the next widget (or at page end),
+    instead of one delta per card/chip/child.
+    """
+    html_parts = []
+    for block_idx, block in enumerate(page.blocks):
+        block_chrome = page_chrome[block_idx]
+        icon = block_chrome.icon
+        html_parts.append(block_chrome.html)
+
+        # Editable content field
+        if block.content:
+            _flush_html(html_parts)
+            use_textarea = len(block.content) > 100
+            edit_key = f"edit_{page.page_number}_{block_idx}"
+
+            if use_textarea:
+                st.text_area(
+                    f"{icon} Content",
+                    value=block.content,
+                    key=edit_key,
+                    on_change=update_doc_state,
+                    args=(block.id, edit_key),
+                    height=min(200, max(80, len(block.content) // 2)),
+                    label_visibility="collapsed",
+                )
+            else:
+                st.text_input(
+                    f"{icon} Content",
+                    value=block.content,
+                    key=edit_key,
+                    on_change=update_doc_state,
+                    args=(block.id, edit_key),
+                    label_visibility="collapsed",
+                )
+
+        # Render children (read-only structure overview)
+        if block.children:
+            html_parts.append(block_chrome.children_html)
+            for child_idx, child in enumerate(block.children):
+                child_chrome = block_chrome.children[child_idx]
+                html_parts.append(child_chrome.html)
+
+                if child.content:
+                    _flush_html(html_parts)
+                    child_key = f"edit_{page.page_number}_{block_idx}_child_{child_idx}"
+                    st.text_input(
+                        f"{child_chrome.icon} {child.block_type}",
+                        value=child.content,
+                        key=child_key,
+                        on_change=update_doc_state,
+                        args=(child.id, child_key),
+                        label_visibility="collapsed",
+                    )
+
+    _flush_html(html_parts)
 
 
 # ────────────────────────────────────────────────────────────
@@ -428,7 +698,7 @@ with tab_preview:
     is_renderable = file_ext in [".pdf", ".jpg", ".jpeg", ".png"]
 
     if in_file is not None and is_renderable:
-        total_pages = get_page_count(in_file)
+        total_pages = st.session_state.total_pages
         col_nav, col_img = st.columns([0.25, 0.75])
 
         with col_nav:
@@ -446,19 +716,25 @@ with tab_preview:
             if page_num < len(doc.pages):
                 page_data = doc.pages[page_num]
                 st.markdown("##### Blocks on this page")
+                block_lines = []
                 for block in page_data.blocks:
                     badge_html = render_block_badge(block.block_type)
                     preview = block.content[:50] + "..." if len(block.content) > 50 else block.content
-                    st.markdown(
-                        f'{badge_html} <span style="font-size:0.78rem; color:#A0A0B8; margin-left:6px;">{preview}</span>',
-                        unsafe_allow_html=True,
+                    block_lines.append(
+                        f'{badge_html} <span style="font-size:0.78rem; color:#A0A0B8; margin-left:6px;">{preview}</span>'
                     )
+                if block_lines:
+                    st.markdown("\n\n".join(block_lines), unsafe_allow_html=True)
 
         with col_img:
             try:
-                pil_image = get_page_image(in_file, page_num)
-                if pil_image:
-                    st.image(pil_image, use_container_width=True, caption=f"Page {page_num + 1}")
+                page_jpeg = _page_image(in_file.type, page_num, preview_width).result()
+                # Warm the neighbouring pages while the user looks at this one
+                for neighbour in (page_num + 1, page_num - 1):
+                    if 0 <= neighbour < total_pages:
+                        _page_image(in_file.type, neighbour, preview_width)
+                if page_jpeg:
+                    st.image(page_jpeg, use_container_width=True, caption=f"Page {page_num + 1}")
                 else:
                     st.warning("Could not render page preview.")
             except Exception as e:
@@ -468,11 +744,12 @@ with tab_preview:
 
         # Show a text-based summary for non-PDF files
         for page in doc.pages:
-            st.markdown(f"#### Page {page.page_number}")
+            summary_lines = [f"#### Page {page.page_number}"]
             for block in page.blocks:
                 icon = get_block_icon(block.block_type)
                 preview = block.content[:120] + "..." if len(block.content) > 120 else block.content
-                st.markdown(f"{icon} **{block.block_type}**: {preview}")
+                summary_lines.append(f"{icon} **{block.block_type}**: {preview}")
+            st.markdown("\n\n".join(summary_lines))
 
 
 # ─── Tab 2: Schema Editor ───
@@ -499,101 +776,9 @@ with tab_editor:
     st.markdown('<div class="gradient-divider"></div>', unsafe_allow_html=True)
 
     # Page-by-page block editor
-    for page in doc.pages:
+    for page, page_chrome in zip(doc.pages, st.session_state.block_chrome):
         with st.expander(f"📄 Page {page.page_number}  —  {len(page.blocks)} blocks", expanded=(page.page_number == 1)):
-            for block_idx, block in enumerate(page.blocks):
-                color = get_block_color(block.block_type)
-                icon = get_block_icon(block.block_type)
-
-                # Block card header
-                header_html = (
-                    f'<div class="editor-block" style="border-left-color: {color};">'
-                    f'<div class="editor-block-header">'
-                    f"<div>{render_block_badge(block.block_type)}</div>"
-                    f'<div class="block-id-label">{block.id}</div>'
-                    f"</div>"
-                )
-
-                # Properties chips
-                if block.properties:
-                    props_dict = block.properties.model_dump(exclude_none=True)
-                    if props_dict:
-                        header_html += f"<div>{render_property_chips(props_dict)}</div>"
-
-                # Section hierarchy
-                if block.section_hierarchy:
-                    hierarchy_str = " → ".join(block.section_hierarchy.values())
-                    header_html += (
-                        f'<div style="font-size:0.72rem; color:#A29BFE; margin-top:4px; margin-bottom:4px;">'
-                        f"📂 {hierarchy_str}</div>"
-                    )
-
-                # Bbox info
-                if block.bbox:
-                    bbox_str = ", ".join(f"{v:.1f}" for v in block.bbox[:4])
-                    header_html += f'<div class="block-id-label">📐 bbox: [{bbox_str}]</div>'
-
-                header_html += "</div>"
-                st.markdown(header_html, unsafe_allow_html=True)
-
-                # Editable content field
-                if block.content:
-                    use_textarea = len(block.content) > 100
-                    edit_key = f"edit_{page.page_number}_{block_idx}"
-
-                    if use_textarea:
-                        st.text_area(
-                            f"{icon} Content",
-                            value=block.content,
-                            key=edit_key,
-                            on_change=update_doc_state,
-                            args=(block.id, edit_key),
-                            height=min(200, max(80, len(block.content) // 2)),
-                            label_visibility="collapsed",
-                        )
-                    else:
-                        st.text_input(
-                            f"{icon} Content",
-                            value=block.content,
-                            key=edit_key,
-                            on_change=update_doc_state,
-                            args=(block.id, edit_key),
-                            label_visibility="collapsed",
-                        )
-
-                # Render children recursively (read-only structure overview)
-                if block.children:
-                    with st.container():
-                        st.markdown(
-                            f'<div style="margin-left:1.5rem; padding-left:1rem; border-left:2px solid {color}30;">'
-                            f'<div style="font-size:0.75rem; color:var(--text-muted); margin-bottom:0.4rem;">↳ {len(block.children)} nested block(s)</div>'
-                            f"</div>",
-                            unsafe_allow_html=True,
-                        )
-                        for child_idx, child in enumerate(block.children):
-                            child_color = get_block_color(child.block_type)
-                            child_icon = get_block_icon(child.block_type)
-
-                            child_html = (
-                                f'<div style="margin-left:1.5rem; padding:0.5rem 0.75rem; '
-                                f"background:rgba(255,255,255,0.02); border-left:2px solid {child_color}40; "
-                                f'border-radius:0 6px 6px 0; margin-bottom:0.3rem;">'
-                                f"{render_block_badge(child.block_type)} "
-                                f'<span class="block-id-label" style="margin-left:8px;">{child.id}</span>'
-                                f"</div>"
-                            )
-                            st.markdown(child_html, unsafe_allow_html=True)
-
-                            if child.content:
-                                child_key = f"edit_{page.page_number}_{block_idx}_child_{child_idx}"
-                                st.text_input(
-                                    f"{child_icon} {child.block_type}",
-                                    value=child.content,
-                                    key=child_key,
-                                    on_change=update_doc_state,
-                                    args=(child.id, child_key),
-                                    label_visibility="collapsed",
-                                )
+            render_page_editor(page, page_chrome)
 
 # ─── Tab 3: JSON View / Code Editor ───
 with tab_json:
@@ -606,37 +791,66 @@ with tab_json:
         unsafe_allow_html=True,
     )
 
-    # Render streamlit-ace editor
-    new_json_val = st_ace(
-        value=st.session_state.synced_json_str,
-        language="json",
-        theme="monokai",
-        key="ace_editor",
-        font_size=13,
-        tab_size=2,
-        wrap=True,
-        show_gutter=True,
-        show_print_margin=False,
-        height=600,
-        auto_update=False, # Wait for the user to lift hands or press Cmd+S
-    )
+    # Component args are re-sent on every rerun, so a very large document
+    # would push its whole JSON to the browser each time; load it on request.
+    editor_open = True
+    if len(_synced_json()) > LARGE_EDITOR_CHARS:
+        editor_open = st.toggle(
+            "Load document into the code editor",
+            value=False,
+            key="ace_open",
+            help="This document is large. Keeping the editor closed makes the rest of the app faster.",
+        )
 
-    # Perform bi-directional sync if code editor fired an update
-    if new_json_val and new_json_val != st.session_state.synced_json_str:
-        try:
-            # First, check if valid JSON AND valid BaselineDocument schema
-            validate_doc = BaselineDocument.model_validate_json(new_json_val)
+    if editor_open:
+        # The editor is keyed by document revision so it remounts with fresh
+        # content after edits made elsewhere (its value is only read on mount).
+        ace_key = f"ace_editor_{st.session_state.doc_revision}"
+        previous_ace_key = st.session_state.get("ace_key")
+        if previous_ace_key and previous_ace_key != ace_key and st.session_state.get(previous_ace_key):
+            # Applied from an editor rendered before Schema Editor edits that only
+            # reran their page fragment; applying it would silently revert them.
+            st.warning(
+                "⚠️ Your JSON edit was made on an outdated copy — the document changed in the "
+                "Schema Editor since. The editor has been refreshed; please re-apply your change."
+            )
+        st.session_state.ace_key = ace_key
+
+        # Render streamlit-ace editor
+        pretty_json_str = _pretty_json(_synced_json())
+        new_json_val = st_ace(
+            value=pretty_json_str,
+            language="json",
+            theme="monokai",
+            key=ace_key,
+            font_size=13,
+            tab_size=2,
+            wrap=True,
+            show_gutter=True,
+            show_print_margin=False,
+            height=600,
+            auto_update=False, # Wait for the user to lift hands or press Cmd+S
+        )
+
+        # Perform bi-directional sync if code editor fired an update
+        if new_json_val and new_json_val != pretty_json_str:
+            try:
+                # First, check if valid JSON AND valid BaselineDocument schema. The
+                # compiled validator rejects broken edits cheaply; Pydantic then
+                # builds the typed model from the already-parsed payload.
+                payload = json.loads(new_json_val)
+                _schema_validator()(payload)
+                validate_doc = BaselineDocument.model_validate(payload)
             
-            # If successful, establish the new Single Source of Truth
-            # Re-serialize to enforce formatting
-            clean_str = validate_doc.model_dump_json(indent=2, exclude_none=True)
-            st.session_state.synced_json_str = clean_str
+                # If successful, establish the new Single Source of Truth
+                _set_document(validate_doc)
+                st.session_state.ace_key = None  # this submission was applied, not stale
             
-            st.success("✅ JSON synced successfully!")
-            st.rerun() # Force UI elements to update with new state
+                st.success("✅ JSON synced successfully!")
+                st.rerun() # Force UI elements to update with new state
             
-        except Exception as e:
-            st.error(f"❌ Invalid JSON or Schema violation. Changes discarded. \n\nError details: `{str(e)}`")
+            except Exception as e:
+                st.error(f"❌ Invalid JSON or Schema violation. Changes discarded. \n\nError details: `{str(e)}`")
 
 
 def main():
@@ -0,0 +1,162 @@
+"""
+Per-tag hot paths of the direct DOCX converter.
+
+Kept free of dynamic tricks and fully annotated so the module can be
+compiled ahead of time with mypyc (``mypyc converter/_docx_fast.py``); the
+compiled extension then shadows this file on import. Uncompiled, it runs
+as ordinary Python with identical behaviour.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Tuple
+
+from lxml import etree
+
+from converter.schema import BaselineBlock, BlockProperties
+
+# Inline CSS properties that map onto BlockProperties fields
+_STYLE_FIELDS = {
+    "color": "color",
+    "background-color": "bg_color",
+    "font-family": "font_family",
+    "font-size": "font_size",
+}
+
+# Shared BlockProperties for the low-cardinality cases (list type, bare
+# heading level); see _interned_props
+_PROPS_CACHE: Dict[Tuple[Tuple[str, Any], ...], BlockProperties] = {}
+
+
+def _interned_props(**fields: Any) -> BlockProperties:
+    """Return a shared BlockProperties for ``fields``, building it once.
+
+    Only for value sets with a handful of variants. The instances are shared
+    between blocks, so they must never be mutated in place.
+    """
+    key = tuple(sorted(fields.items()))
+    props = _PROPS_CACHE.get(key)
+    if props is None:
+        props = _PROPS_CACHE[key] = BlockProperties(**fields)
+    return props
+
+
+def _extract_inline_styles(tag: etree._Element) -> Optional[Dict[str, Any]]:
+    """Pull inline CSS style properties into BlockProperties fields.
+
+    Returns None when the tag has no ``style`` attribute (the usual case
+    for mammoth output), so callers can skip building a dict.
+    """
+    style: Optional[str] = tag.get("style")
+    if not style:
+        return None
+
+    props: Dict[str, Any] = {}
+
+    # One pass over the declarations; the first occurrence of a property wins
+    for decl in style.split(";"):
+        name, sep, value = decl.partition(":")
+        if not sep:
+            continue
+        field = _STYLE_FIELDS.get(name.strip().lower())
+        if field and field not in props:
+            props[field] = value.strip()
+
+    return props
+
+
+def _get_text(tag: etree._Element) -> str:
+    """Get clean text from a tag.
+
+    Text nodes are joined with a space (so ``a<b>b</b>`` reads "a b"), and
+    comments are skipped, as BeautifulSoup's get_text(" ", strip=True) did.
+    """
+    return " ".join(" ".join(tag.itertext()).split())
+
+
+def _to_html(tag: etree._Element) -> str:
+    """Serialize a tag (without its tail text) back to HTML."""
+    return etree.tostring(tag, encoding="unicode", method="html", with_tail=False)
+
+
+def _parse_table(
+    table_tag: etree._Element,
+    block_idx: int,
+    include_html: bool = False,
+    text: Optional[str] = None,
+    page_idx: int = 0,
+) -> BaselineBlock:
+    """Parse an HTML <table> into a BaselineBlock with children rows/cells.
+
+    ``text`` is the table's already-extracted text, if the caller has it;
+    ``page_idx`` is the page the table lands on, used in every child id.
+    """
+    # Only this table's own rows and cells: a recursive find_all would also
+    # pick up the rows of tables nested inside cells.
+    rows: List[etree._Element] = []
+    for child in table_tag:
+        if child.tag == "tr":
+            rows.append(child)
+        elif child.tag in ("thead", "tbody", "tfoot"):
+            rows.extend(tr for tr in child if tr.tag == "tr")
+
+    children: List[BaselineBlock] = []
+    column_count = 0
+    for r_idx, row in enumerate(rows):
+        cells = [cell for cell in row if cell.tag in ("td", "th")]
+        if r_idx == 0:
+            column_count = len(cells)
+        cell_children: List[BaselineBlock] = []
+        for c_idx, cell in enumerate(cells):
+            cell_children.append(BaselineBlock(
+                id=f"page_{page_idx}/TableCell/{block_idx}_r{r_idx}_c{c_idx}",
+                block_type="Text",
+                content=_get_text(cell),
+            ))
+        children.append(BaselineBlock(
+            id=f"page_{page_idx}/TableRow/{block_idx}_r{r_idx}",
+            block_type="Text",
+            content="",
+            children=cell_children,
+        ))
+
+    props = BlockProperties(
+        row_count=len(rows),
+        column_count=column_count,
+    )
+
+    return BaselineBlock(
+        id=f"page_{page_idx}/Table/{block_idx}",
+        block_type="Table",
+        content=_get_text(table_tag) if text is None else text,
+        html=_to_html(table_tag) if include_html else "",
+        properties=props,
+        children=children,
+    )
+
+
+def _parse_list(
+    list_tag: etree._Element,
+    block_idx: int,
+    include_html: bool = False,
+    page_idx: int = 0,
+) -> BaselineBlock:
+    """Parse <ul>/<ol> into a ListGroup with ListItem children."""
+    list_type = "ordered" if list_tag.tag == "ol" else "unordered"
+    items = [li for li in list_tag if li.tag == "li"]
+    children: List[BaselineBlock] = []
+    for i, li in enumerate(items):
+        children.append(BaselineBlock(
+            id=f"page_{page_idx}/ListItem/{block_idx}_{i}",
+            block_type="ListItem",
+            content=_get_text(li),
+        ))
+
+    return BaselineBlock(
+        id=f"page_{page_idx}/ListGroup/{block_idx}",
+        block_type="ListGroup",
+        content="",
+        html=_to_html(list_tag) if include_html else "",
+        properties=_interned_props(list_type=list_type),
+        children=children,
+    )
@@ -1,10 +1,48 @@
-import io
 import logging
+import tempfile
 from typing import Optional
 from converter.schema import BaselineDocument
 
 logger = logging.getLogger(__name__)
 
+# Exports larger than this are buffered on disk while python-docx writes them
+SPOOL_MAX_BYTES = 8 * 1024 * 1024
+
+
+# python-docx names used by the exporter, imported on first export (see _docx_api)
+_docx = None
+
+
+def _docx_api():
+    """Import python-docx once and return the names the exporter needs.
+
+    Deferred so importing this module doesn't pull in python-docx, but
+    resolved a single time rather than on every export. Raises ImportError
+    if python-docx is missing.
+    """
+    global _docx
+    if _docx is None:
+        from docx import Document
+        from docx.enum.text import WD_ALIGN_PARAGRAPH, WD_BREAK
+        from docx.oxml import OxmlElement
+        from docx.oxml.table import CT_Tbl
+        from docx.table import Table
+        from docx.text.paragraph import Paragraph
+
+        _docx = (Document, WD_ALIGN_PARAGRAPH, WD_BREAK, OxmlElement, CT_Tbl, Table, Paragraph)
+    return _docx
+
+
+def _resolve_style(styles, *names):
+    """Return the first of ``names`` defined in the document's styles, or None."""
+    for name in names:
+        try:
+            return styles[name]
+        except KeyError:
+            continue
+    return None
+
+
 def export_edited_docx(baseline_doc: BaselineDocument) -> Optional[bytes]:
     """
     Converts a BaselineDocument schema into a fully formatted Microsoft Word (.docx) file.
@@ -16,88 +54,144 @@ def export_edited_docx(baseline_doc: BaselineDocument) -> Optional[bytes]:
         The new DOCX as bytes, or None if it fails.
     """
     try:
-        from docx import Document
-        from docx.shared import Pt, Inches
-        from docx.enum.text import WD_ALIGN_PARAGRAPH
-        
+        Document, WD_ALIGN_PARAGRAPH, WD_BREAK, OxmlElement, CT_Tbl, Table, Paragraph = _docx_api()
+
         doc = Document()
+
+        # Paragraphs and tables are built detached and spliced into the body
+        # in one go at the end: python-docx's add_paragraph/add_table look up
+        # the body's trailing sectPr on every call, which makes appending
+        # quadratic in document length.
+        elements = []
+        block_width = doc._block_width  # the width doc.add_table would use
+
+        def add_paragraph(text="", style=None):
+            p = OxmlElement("w:p")
+            paragraph = Paragraph(p, doc)
+            if text:
+                paragraph.add_run(text)
+            if style is not None:
+                paragraph.style = style
+            elements.append(p)
+            return paragraph
+
+        heading_styles = {}
+
+        def add_heading(text, level):
+            style = heading_styles.get(level)
+            if style is None:
+                style = heading_styles[level] = doc.styles["Title" if level == 0 else "Heading %d" % level]
+            return add_paragraph(text, style)
+
+        def add_table(rows, cols):
+            tbl = CT_Tbl.new_tbl(rows, cols, block_width)
+            elements.append(tbl)
+            return Table(tbl, doc)
+
+        # Resolve styles once; assigning by name re-scans the styles part
+        # for every paragraph. The default template names the code style
+        # "macro" rather than "Macro Text".
+        quote_style = _resolve_style(doc.styles, 'Quote')
+        list_number_style = _resolve_style(doc.styles, 'List Number')
+        list_bullet_style = _resolve_style(doc.styles, 'List Bullet')
+        code_style = _resolve_style(doc.styles, 'Macro Text', 'macro')
+        table_style = _resolve_style(doc.styles, 'Table Grid')
         
         # Title of document
         if baseline_doc.title:
-            doc.add_heading(baseline_doc.title, 0)
+            add_heading(baseline_doc.title, 0)
             
+        def emit_section_header(block, content):
+            level = 1 # docx heading levels are 1-9
+            if block.properties and block.properties.heading_level:
+                level = min(9, max(1, block.properties.heading_level))
+            add_heading(content, level)
+
+        def emit_text(block, content):
+            p = add_paragraph(content)
+            if block.properties and block.properties.blockquote:
+                p.style = quote_style
+
+        def emit_list(block, content):
+            style = list_number_style if (block.properties and block.properties.list_type == "ordered") else list_bullet_style
+            if content:
+                add_paragraph(content) # optional leading text
+            for child in block.children:
+                add_paragraph(child.content or "", style=style)
+
+        def emit_table(block, content):
+            # Simplified table logic
+            if block.children:
+                # Assumes format: Table -> [Row, Row] -> [Cell, Cell]
+                rows = len(block.children)
+                cols = len(block.children[0].children) if rows > 0 and block.children[0].children else 1
+
+                table = add_table(rows, cols)
+                table.style = table_style
+
+                for r_idx, row in enumerate(block.children):
+                    for c_idx, cell in enumerate(row.children):
+                        if c_idx < cols:
+                            table.cell(r_idx, c_idx).text = cell.content or ""
+            else:
+                p = add_paragraph(content)
+                p.style = code_style
+
+        def emit_code(block, content):
+            p = add_paragraph(content)
+            p.style = code_style
+
+        def emit_equation(block, content):
+            p = add_paragraph(f"[Equation] {content}")
+            p.alignment = WD_ALIGN_PARAGRAPH.CENTER
+
+        def emit_default(block, content):
+            add_paragraph(content)
+
+        emitters = {
+            "SectionHeader": emit_section_header,
+            "Text": emit_text,
+            "List": emit_list,
+            "Table": emit_table,
+            "Code": emit_code,
+            "Equation": emit_equation,
+        }
+
         def process_blocks(blocks):
-            for block in blocks:
+            # Explicit pre-order walk: a block's children are written right
+            # after it and before its next sibling, as in the document tree.
+            stack = list(reversed(blocks))
+            while stack:
+                block = stack.pop()
                 if not block.content and not block.children:
                     continue
-                    
-                content = block.content or ""
-                is_blockquote = block.properties and block.properties.blockquote
-                
-                if block.block_type == "SectionHeader":
-                    level = 1 # docx heading levels are 1-9
-                    if block.properties and block.properties.heading_level:
-                        level = min(9, max(1, block.properties.heading_level))
-                    doc.add_heading(content, level=level)
-                
-                elif block.block_type == "Text":
-                    p = doc.add_paragraph(content)
-                    if is_blockquote:
-                        p.style = 'Quote'
-                
-                elif block.block_type == "List":
-                    style = 'List Number' if (block.properties and block.properties.list_type == "ordered") else 'List Bullet'
-                    if content:
-                        doc.add_paragraph(content) # optional leading text
-                    if block.children:
-                        for child in block.children:
-                            child_content = child.content or ""
-                            doc.add_paragraph(child_content, style=style)
-                    continue # handled children
-                
-                elif block.block_type == "Table":
-                    # Simplified table logic
-                    if block.children:
-                        # Assumes format: Table -> [Row, Row] -> [Cell, Cell]
-                        rows = len(block.children)
-                        cols = len(block.children[0].children) if rows > 0 and block.children[0].children else 1
-                        
-                        table = doc.add_table(rows=rows, cols=cols)
-                        table.style = 'Table Grid'
-                        
-                        for r_idx, row in enumerate(block.children):
-                            for c_idx, cell in enumerate(row.children):
-                                if c_idx < cols:
-                                    cell_content = cell.content or ""
-                                    table.cell(r_idx, c_idx).text = cell_content
-                    else:
-                        p = doc.add_paragraph(content)
-                        p.style = 'Macro Text'
-                
-                elif block.block_type == "Code":
-                    p = doc.add_paragraph(content)
-                    p.style = 'Macro Text'
-                
-                elif block.block_type == "Equation":
-                    p = doc.add_paragraph(f"[Equation] {content}")
-                    p.alignment = WD_ALIGN_PARAGRAPH.CENTER
-                
-                else:
-                    doc.add_paragraph(content)
-                
-                if block.children and block.block_type not in ["List", "Table"]:
-                    process_blocks(block.children)
-
-        for page in baseline_doc.pages:
+
+                emitters.get(block.block_type, emit_default)(block, block.content or "")
+
+                # Lists and tables write their own children above
+                if block.children and block.block_type not in ("List", "Table"):
+                    stack.extend(reversed(block.children))
+
+        last_page_idx = len(baseline_doc.pages) - 1
+        for page_idx, page in enumerate(baseline_doc.pages):
             process_blocks(page.blocks)
-            if page != baseline_doc.pages[-1]:
-                doc.add_page_break()
+            if page_idx != last_page_idx:
+                add_paragraph().add_run().add_break(WD_BREAK.PAGE)
 
-        # Save to memory stream
-        target_stream = io.BytesIO()
-        doc.save(target_stream)
-        
-        return target_stream.getvalue()
+        body = doc.element.body
+        sect_pr = body.sectPr
+        if sect_pr is not None:
+            body.remove(sect_pr)
+        body.extend(elements)
+        if sect_pr is not None:
+            body.append(sect_pr)
+
+        # Save to a spooled file: small documents stay in memory, large ones
+        # spill to disk instead of growing one ever-reallocated buffer
+        with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES) as target_stream:
+            doc.save(target_stream)
+            target_stream.seek(0)
+            return target_stream.read()
         
     except ImportError:
         logger.error("python-docx is not installed. Cannot export DOCX.")
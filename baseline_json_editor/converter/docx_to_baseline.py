@@ -10,11 +10,18 @@ from __future__ import annotations
 
 import logging
 import os
-import re
-from typing import Any, Dict, List, Optional
+from typing import Dict, Iterator, List, Union
 
-from bs4 import BeautifulSoup, NavigableString, Tag
+from lxml import etree
 
+from converter._docx_fast import (
+    _extract_inline_styles,
+    _get_text,
+    _interned_props,
+    _parse_list,
+    _parse_table,
+    _to_html,
+)
 from converter.schema import (
     BaselineBlock,
     BaselineDocument,
@@ -25,133 +32,88 @@ from converter.schema import (
 
 logger = logging.getLogger(__name__)
 
+# Blocks per synthetic page. DOCX has no fixed pagination, so blocks are
+# split roughly by an estimated page capacity; this keeps the editor from
+# showing everything as one massive scrolling page.
+BLOCKS_PER_PAGE = 35
+
+# Tag-name groups for the top-level walk (lxml's HTML parser lowercases names)
+_HEADING_TAGS = frozenset(("h1", "h2", "h3", "h4", "h5", "h6"))
+_LIST_TAGS = frozenset(("ul", "ol"))
+_CODE_TAGS = frozenset(("pre", "code"))
+_FIGURE_TAGS = frozenset(("img", "figure"))
+# Tags whose own text is never used (their children or alt text are)
+_NO_TEXT_TAGS = _LIST_TAGS | _FIGURE_TAGS
+# Tags kept even when they contain no text
+_KEEP_EMPTY_TAGS = _NO_TEXT_TAGS | {"table"}
+
 
-def _tag_to_block_type(tag: Tag) -> str:
+def _tag_to_block_type(tag: etree._Element) -> str:
     """Map an HTML tag to a Baseline block_type."""
-    name = tag.name.lower()
-    if name in ("h1", "h2", "h3", "h4", "h5", "h6"):
+    name = tag.tag
+    if name in _HEADING_TAGS:
         return "SectionHeader"
     if name == "table":
         return "Table"
-    if name in ("ul", "ol"):
+    if name in _LIST_TAGS:
         return "ListGroup"
     if name == "li":
         return "ListItem"
-    if name in ("pre", "code"):
+    if name in _CODE_TAGS:
         return "Code"
     if name == "blockquote":
         return "Text"
-    if name in ("img", "figure"):
+    if name in _FIGURE_TAGS:
         return "Figure"
     # p, div, span, etc.
     return "Text"
 
 
-def _extract_inline_styles(tag: Tag) -> Dict[str, Any]:
-    """Pull inline CSS style properties into BlockProperties fields."""
-    props: Dict[str, Any] = {}
-    style = tag.get("style", "")
-    if not style:
-        return props
-
-    # color
-    m = re.search(r'(?<![a-z-])color\s*:\s*([^;]+)', style)
-    if m:
-        props["color"] = m.group(1).strip()
-
-    # background-color
-    m = re.search(r'background-color\s*:\s*([^;]+)', style)
-    if m:
-        props["bg_color"] = m.group(1).strip()
-
-    # font-family
-    m = re.search(r'font-family\s*:\s*([^;]+)', style)
-    if m:
-        props["font_family"] = m.group(1).strip()
-
-    # font-size
-    m = re.search(r'font-size\s*:\s*([^;]+)', style)
-    if m:
-        props["font_size"] = m.group(1).strip()
-
-    return props
-
-
-def _get_text(tag: Tag) -> str:
-    """Get clean text from a tag."""
-    text = tag.get_text(separator=" ", strip=True)
-    return re.sub(r"\s+", " ", text).strip()
-
-
-def _parse_table(table_tag: Tag, block_idx: int) -> BaselineBlock:
-    """Parse an HTML <table> into a BaselineBlock with children rows/cells."""
-    rows = table_tag.find_all("tr")
-    children = []
-    for r_idx, row in enumerate(rows):
-        cells = row.find_all(["td", "th"])
-        cell_children = []
-        for c_idx, cell in enumerate(cells):
-            cell_children.append(BaselineBlock(
-                id=f"page_0/TableCell/{block_idx}_r{r_idx}_c{c_idx}",
-                block_type="Text",
-                content=_get_text(cell),
-                html=str(cell),
-            ))
-        children.append(BaselineBlock(
-            id=f"page_0/TableRow/{block_idx}_r{r_idx}",
-            block_type="Text",
-            content="",
-            html=str(row),
-            children=cell_children,
-        ))
+# mammoth module, imported on first conversion (see _mammoth)
+_mammoth_module = None
 
-    props = BlockProperties(
-        row_count=len(rows),
-        column_count=len(rows[0].find_all(["td", "th"])) if rows else 0,
-    )
 
-    return BaselineBlock(
-        id=f"page_0/Table/{block_idx}",
-        block_type="Table",
-        content=_get_text(table_tag),
-        html=str(table_tag),
-        properties=props,
-        children=children,
-    )
+def _mammoth():
+    """Import mammoth once, on first use, and return the module."""
+    global _mammoth_module
+    if _mammoth_module is None:
+        import mammoth
 
+        _mammoth_module = mammoth
+    return _mammoth_module
 
-def _parse_list(list_tag: Tag, block_idx: int) -> BaselineBlock:
-    """Parse <ul>/<ol> into a ListGroup with ListItem children."""
-    list_type = "ordered" if list_tag.name == "ol" else "unordered"
-    items = list_tag.find_all("li", recursive=False)
-    children = []
-    for i, li in enumerate(items):
-        children.append(BaselineBlock(
-            id=f"page_0/ListItem/{block_idx}_{i}",
-            block_type="ListItem",
-            content=_get_text(li),
-            html=str(li),
-        ))
 
-    return BaselineBlock(
-        id=f"page_0/ListGroup/{block_idx}",
-        block_type="ListGroup",
-        content="",
-        html=str(list_tag),
-        properties=BlockProperties(list_type=list_type),
-        children=children,
-    )
+def _top_level_nodes(body: etree._Element) -> Iterator[Union[str, etree._Element]]:
+    """Yield body's children in document order: bare text as str, then tags.
+
+    lxml keeps text between elements on the preceding element's ``tail``
+    rather than as separate nodes; comments and processing instructions are
+    skipped, though their tail text is kept.
+    """
+    if body.text:
+        yield body.text
+    for child in body:
+        if isinstance(child.tag, str):
+            yield child
+        if child.tail:
+            yield child.tail
 
 
 def convert_docx_direct(
     filepath: str,
     progress_callback=None,
+    include_html: bool = False,
 ) -> BaselineDocument:
     """
     Convert a DOCX file directly to BaselineDocument without any API calls.
     Uses mammoth for DOCX→HTML, then parses the HTML into blocks.
+
+    Top-level blocks only get their ``html`` when ``include_html`` is set;
+    nothing downstream reads it (exports strip it), and serializing every
+    subtree back to HTML is a large share of the parse. Table rows/cells and
+    list items never carry html.
     """
-    import mammoth
+    mammoth = _mammoth()
 
     if progress_callback:
         progress_callback(0.1, "Reading DOCX with mammoth...")
@@ -169,67 +131,73 @@ def convert_docx_direct(
     if progress_callback:
         progress_callback(0.4, "Parsing HTML structure into blocks...")
 
-    soup = BeautifulSoup(html_str, "html.parser")
+    # libxml2 parses straight into a C tree. The fragment goes inside an
+    # explicit <body>: left to imply one, libxml2 before 2.14 also wraps
+    # leading bare text in a <p>, turning the bare-text block into a paragraph
+    root = etree.fromstring(f"<html><body>{html_str}</body></html>", etree.HTMLParser())
+    body = root.find("body")
 
     blocks: List[BaselineBlock] = []
     block_type_counts: Dict[str, int] = {}
     block_idx = 0
 
     # Walk top-level elements
-    for element in soup.children:
-        if isinstance(element, NavigableString):
-            text = str(element).strip()
+    for element in _top_level_nodes(body):
+        # Ids carry their final page from the start; no re-id pass later
+        page_idx = block_idx // BLOCKS_PER_PAGE
+        if isinstance(element, str):
+            text = element.strip()
             if not text:
                 continue
             # Bare text node
             blocks.append(BaselineBlock(
-                id=f"page_0/Text/{block_idx}",
+                id=f"page_{page_idx}/Text/{block_idx}",
                 block_type="Text",
                 content=text,
-                html=text,
+                html=text if include_html else "",
             ))
             block_type_counts["Text"] = block_type_counts.get("Text", 0) + 1
             block_idx += 1
             continue
 
-        if not isinstance(element, Tag):
-            continue
-
-        tag_name = element.name.lower()
+        tag_name = element.tag
 
-        # Skip empty tags
-        text = _get_text(element)
-        if not text and tag_name not in ("table", "ul", "ol", "img", "figure"):
+        # Skip empty tags. Text is extracted once here and reused below; lists
+        # and images never use the parent's text, so don't walk them for it.
+        text = "" if tag_name in _NO_TEXT_TAGS else _get_text(element)
+        if not text and tag_name not in _KEEP_EMPTY_TAGS:
             continue
 
         # Tables
         if tag_name == "table":
-            block = _parse_table(element, block_idx)
+            block = _parse_table(element, block_idx, include_html, text, page_idx)
             blocks.append(block)
             block_type_counts["Table"] = block_type_counts.get("Table", 0) + 1
             block_idx += 1
             continue
 
         # Lists
-        if tag_name in ("ul", "ol"):
-            block = _parse_list(element, block_idx)
+        if tag_name in _LIST_TAGS:
+            block = _parse_list(element, block_idx, include_html, page_idx)
             blocks.append(block)
             block_type_counts["ListGroup"] = block_type_counts.get("ListGroup", 0) + 1
             block_idx += 1
             continue
 
         # Headings
-        if tag_name in ("h1", "h2", "h3", "h4", "h5", "h6"):
+        if tag_name in _HEADING_TAGS:
             level = int(tag_name[1])
             style_props = _extract_inline_styles(element)
-            style_props["heading_level"] = level
-            props = BlockProperties(**style_props)
+            if style_props:
+                props = BlockProperties(heading_level=level, **style_props)
+            else:
+                props = _interned_props(heading_level=level)
 
             blocks.append(BaselineBlock(
-                id=f"page_0/SectionHeader/{block_idx}",
+                id=f"page_{page_idx}/SectionHeader/{block_idx}",
                 block_type="SectionHeader",
                 content=text,
-                html=str(element),
+                html=_to_html(element) if include_html else "",
                 properties=props,
             ))
             block_type_counts["SectionHeader"] = block_type_counts.get("SectionHeader", 0) + 1
@@ -239,37 +207,36 @@ def convert_docx_direct(
         # Blockquotes
         if tag_name == "blockquote":
             style_props = _extract_inline_styles(element)
-            style_props["blockquote"] = True
             blocks.append(BaselineBlock(
-                id=f"page_0/Text/{block_idx}",
+                id=f"page_{page_idx}/Text/{block_idx}",
                 block_type="Text",
                 content=text,
-                html=str(element),
-                properties=BlockProperties(**style_props),
+                html=_to_html(element) if include_html else "",
+                properties=BlockProperties(blockquote=True, **(style_props or {})),
             ))
             block_type_counts["Text"] = block_type_counts.get("Text", 0) + 1
             block_idx += 1
             continue
 
         # Code blocks
-        if tag_name in ("pre", "code"):
+        if tag_name in _CODE_TAGS:
             blocks.append(BaselineBlock(
-                id=f"page_0/Code/{block_idx}",
+                id=f"page_{page_idx}/Code/{block_idx}",
                 block_type="Code",
                 content=text,
-                html=str(element),
+                html=_to_html(element) if include_html else "",
             ))
             block_type_counts["Code"] = block_type_counts.get("Code", 0) + 1
             block_idx += 1
             continue
 
         # Images / Figures
-        if tag_name in ("img", "figure"):
+        if tag_name in _FIGURE_TAGS:
             blocks.append(BaselineBlock(
-                id=f"page_0/Figure/{block_idx}",
+                id=f"page_{page_idx}/Figure/{block_idx}",
                 block_type="Figure",
                 content=element.get("alt", ""),
-                html=str(element),
+                html=_to_html(element) if include_html else "",
             ))
             block_type_counts["Figure"] = block_type_counts.get("Figure", 0) + 1
             block_idx += 1
@@ -280,10 +247,10 @@ def convert_docx_direct(
         props = BlockProperties(**style_props) if style_props else None
 
         blocks.append(BaselineBlock(
-            id=f"page_0/Text/{block_idx}",
+            id=f"page_{page_idx}/Text/{block_idx}",
             block_type="Text",
             content=text,
-            html=str(element),
+            html=_to_html(element) if include_html else "",
             properties=props,
         ))
         block_type_counts["Text"] = block_type_counts.get("Text", 0) + 1
@@ -295,32 +262,19 @@ def convert_docx_direct(
     filename = os.path.basename(filepath)
     title = os.path.splitext(filename)[0].replace("_", " ").replace("-", " ").title()
 
-    # Split blocks roughly by an estimated capacity per page (e.g. ~35 blocks per page)
-    # This prevents the DOCX from dumping everything into a single massive scrolling page.
-    BLOCKS_PER_PAGE = 35
     pages: List[BaselinePage] = []
     
     if not blocks:
         # Create an empty page if no content
         pages.append(BaselinePage(page_number=1, width=612, height=792, blocks=[]))
     else:
-        for i in range(0, len(blocks), BLOCKS_PER_PAGE):
-            chunk = blocks[i : i + BLOCKS_PER_PAGE]
-            # Rename the ids to match the new page number
-            page_num = (i // BLOCKS_PER_PAGE) + 1
-            for block in chunk:
-                # Replace 'page_0/' with f'page_{page_num-1}/'
-                block.id = block.id.replace("page_0/", f"page_{page_num-1}/")
-                if block.children:
-                    for child in block.children:
-                        child.id = child.id.replace("page_0/", f"page_{page_num-1}/")
-
+        for page_idx, start in enumerate(range(0, len(blocks), BLOCKS_PER_PAGE)):
             pages.append(
                 BaselinePage(
-                    page_number=page_num,
+                    page_number=page_idx + 1,
                     width=612,
                     height=792,
-                    blocks=chunk,
+                    blocks=blocks[start : start + BLOCKS_PER_PAGE],
                 )
             )
 
@@ -36,83 +36,83 @@ def export_edited_html(baseline_doc: BaselineDocument) -> Optional[str]:
             "<body>",
         ]
 
+        def emit_section_header(block, content):
+            level = 2 # default
+            if block.properties and block.properties.heading_level:
+                level = min(6, max(1, block.properties.heading_level))
+            html_parts.append(f"<h{level}>{content}</h{level}>")
+
+        def emit_text(block, content):
+            if block.properties and block.properties.blockquote:
+                html_parts.append(f"<blockquote><p>{content}</p></blockquote>")
+            else:
+                html_parts.append(f"<p>{content}</p>")
+
+        def emit_list(block, content):
+            # We render the text part, then the children inside a list tag
+            list_tag = "ol" if (block.properties and block.properties.list_type == "ordered") else "ul"
+            if content:
+                html_parts.append(f"<p>{content}</p>")
+            html_parts.append(f"<{list_tag}>")
+            # Simple 1-level child logic for now
+            html_parts.extend(f"<li>{html.escape(child.content or '')}</li>" for child in block.children)
+            html_parts.append(f"</{list_tag}>")
+
+        def emit_table(block, content):
+            # For Tables, we generate a simple HTML table structure.
+            # Since Marker/Vision APIs sometimes dump table content as markdown or raw text in `content`
+            # we wrap it in a pre block if it's not structured children
+            if block.children:
+                html_parts.append("<table>")
+                # Basic assumption of a list of list rows
+                for row in block.children:
+                    html_parts.append("<tr>")
+                    html_parts.extend(f"<td>{html.escape(cell.content or '')}</td>" for cell in row.children)
+                    html_parts.append("</tr>")
+                html_parts.append("</table>")
+            else:
+                # Fallback if the whole table is just a string (markdown representation)
+                html_parts.append(f"<pre><code>{content}</code></pre>")
+
+        def emit_code(block, content):
+            html_parts.append(f"<pre><code>{content}</code></pre>")
+
+        def emit_equation(block, content):
+            # Wrap in simple div, LaTeX rendering requires MathJax/KaTeX
+            html_parts.append(f"<div class='equation'>\\[ {content} \\]</div>")
+
+        def emit_default(block, content):
+            # Fallback for Generic or unknown types
+            html_parts.append(f"<div>{content}</div>")
+
+        emitters = {
+            "SectionHeader": emit_section_header,
+            "Text": emit_text,
+            "List": emit_list,
+            "Table": emit_table,
+            "Code": emit_code,
+            "Equation": emit_equation,
+        }
+
         def process_blocks(blocks):
             for block in blocks:
                 if not block.content and not block.children:
                     continue
-                    
-                content = html.escape(block.content or "")
-                
-                # Check properties first
-                is_blockquote = block.properties and block.properties.blockquote
-                
-                if block.block_type == "SectionHeader":
-                    level = 2 # default
-                    if block.properties and block.properties.heading_level:
-                        level = min(6, max(1, block.properties.heading_level))
-                    html_parts.append(f"<h{level}>{content}</h{level}>")
-                
-                elif block.block_type == "Text":
-                    if is_blockquote:
-                        html_parts.append(f"<blockquote><p>{content}</p></blockquote>")
-                    else:
-                        html_parts.append(f"<p>{content}</p>")
-                
-                elif block.block_type == "List":
-                    # We render the text part, then process children inside a list tag
-                    list_tag = "ol" if (block.properties and block.properties.list_type == "ordered") else "ul"
-                    if content:
-                        html_parts.append(f"<p>{content}</p>")
-                    html_parts.append(f"<{list_tag}>")
-                    if block.children:
-                        for child in block.children:
-                            child_content = html.escape(child.content or "")
-                            html_parts.append(f"<li>{child_content}</li>")
-                            # Simple 1-level child logic for now
-                    html_parts.append(f"</{list_tag}>")
-                    continue # handled children
-                
-                elif block.block_type == "Table":
-                    # For Tables, we generate a simple HTML table structure.
-                    # This assumes children might be rows/cells, or content is pre-formatted.
-                    # Since Marker/Vision APIs sometimes dump table content as markdown or raw text in `content`
-                    # we will wrap it in a pre block if it's not structured children
-                    if block.children:
-                        html_parts.append("<table>")
-                        # Basic assumption of a list of list rows
-                        for row in block.children:
-                            html_parts.append("<tr>")
-                            for cell in row.children:
-                                cell_content = html.escape(cell.content or "")
-                                html_parts.append(f"<td>{cell_content}</td>")
-                            html_parts.append("</tr>")
-                        html_parts.append("</table>")
-                    else:
-                        # Fallback if the whole table is just a string (markdown representation)
-                        html_parts.append(f"<pre><code>{content}</code></pre>")
-                
-                elif block.block_type == "Code":
-                    html_parts.append(f"<pre><code>{content}</code></pre>")
-                
-                elif block.block_type == "Equation":
-                    # Wrap in simple div, LaTeX rendering requires MathJax/KaTeX
-                    html_parts.append(f"<div class='equation'>\\[ {content} \\]</div>")
-                
-                else:
-                    # Fallback for Generic or unknown types
-                    html_parts.append(f"<div>{content}</div>")
-                
-                # Process children specifically if not already handled
-                if block.children and block.block_type not in ["List", "Table"]:
+
+                emitters.get(block.block_type, emit_default)(block, html.escape(block.content or ""))
+
+                # Lists and tables write their own children above
+                if block.children and block.block_type not in ("List", "Table"):
                     html_parts.append("<div class='children' style='margin-left: 1rem;'>")
                     process_blocks(block.children)
                     html_parts.append("</div>")
 
-        for page in baseline_doc.pages:
+        last_page_idx = len(baseline_doc.pages) - 1
+        for page_idx, page in enumerate(baseline_doc.pages):
             html_parts.append(f"<div class='page' id='page-{page.page_number}'>")
             process_blocks(page.blocks)
             html_parts.append("</div>")
-            if page != baseline_doc.pages[-1]:
+            if page_idx != last_page_idx:
                 html_parts.append("<hr style='border: 0; border-top: 1px dashed #ccc; margin: 2rem 0;' />")
 
         html_parts.append("</body>")
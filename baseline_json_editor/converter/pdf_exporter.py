@@ -1,11 +1,182 @@
 import io
 import fitz  # PyMuPDF
 import logging
+import multiprocessing
+import os
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
 from typing import Optional
-from converter.schema import BaselineDocument
+from converter.schema import BaselineDocument, BaselinePage
 
 logger = logging.getLogger(__name__)
 
+def _apply_page_edits(pdf_doc, page_data: BaselinePage) -> None:
+    """Erase and redraw the edited blocks of one baseline page in ``pdf_doc``."""
+    # fitz pages are 0-indexed, and baseline page_number is 1-indexed (usually) or 0-indexed depending on parsing
+    # Let's assume baseline page_number is 0-indexed based on how we built it, but we can verify.
+    # In our schema it says: page_number: int. Let's assume it maps directly to fitz index.
+    # If our page_number is 1-indexed, we subtract 1.
+    # Let's just use the array index since they should be sequential.
+    fitz_page = pdf_doc.load_page(page_data.page_number)
+    
+    # The coordinates in Marker are usually given in points matching the PDF page size.
+    # Let's verify width/height match roughly to handle scaling if needed.
+    # (In a production app, we would apply a scaling matrix here if Marker's bbox DPI != PDF native DPI).
+    
+    # Erases and text are batched into one Shape per page instead of
+    # page.draw_rect/insert_textbox, which build and commit a Shape
+    # (rewriting the page's content stream) on every call. A Shape
+    # writes all its drawings before all its text, so it is committed
+    # early whenever a new box would cover text already in it; that
+    # keeps the original paint order (e.g. a child's box erasing its
+    # parent's new text).
+    shape = fitz_page.new_shape()
+    text_rects = []
+
+    def process_blocks(blocks):
+        nonlocal shape
+        for block in blocks:
+            if block.bbox and len(block.bbox) == 4 and block.content:
+                # block.bbox is [x0, y0, x1, y1]
+                rect = fitz.Rect(block.bbox)
+                if any(rect.intersects(r) for r in text_rects):
+                    shape.commit()
+                    shape = fitz_page.new_shape()
+                    text_rects.clear()
+                
+                # 1. Erase the old content by drawing a white rectangle
+                shape.draw_rect(rect)
+                shape.finish(color=(1, 1, 1), fill=(1, 1, 1))
+                
+                # 2. Draw the new content
+                # We try to fit the text in the box. `insert_textbox` handles wrapping.
+                # For a real premium feel, we could try to detect the original font size,
+                # but for now we let fitz auto-scale or pick a standard font size that fits.
+                try:
+                    rc = shape.insert_textbox(
+                        rect, 
+                        block.content, 
+                        fontsize=11, 
+                        fontname="helv", 
+                        color=(0, 0, 0),
+                        align=0 # left align
+                    )
+                    if rc >= 0:
+                        text_rects.append(rect)
+                except Exception as e:
+                    logger.error(f"Failed to draw text for block {block.id}: {e}")
+            
+            # Recursively process children
+            if block.children:
+                process_blocks(block.children)
+    
+    process_blocks(page_data.blocks)
+    shape.commit()
+
+
+# Exports with at least this many edited pages are split into contiguous page
+# ranges, edited in worker processes and reassembled; below it, starting the
+# workers costs more than the drawing they take over
+PARALLEL_EXPORT_MIN_PAGES = 64
+# Upper bound on worker processes for one export
+PARALLEL_EXPORT_MAX_WORKERS = 8
+
+
+def _export_page_range(pdf_bytes: bytes, start: int, stop: int, pages_json: list) -> bytes:
+    """Worker: apply the edits in ``pages_json`` and return pages [start, stop) as a PDF."""
+    pdf_doc = fitz.open(stream=pdf_bytes, filetype="pdf")
+    try:
+        for page_json in pages_json:
+            _apply_page_edits(pdf_doc, BaselinePage.model_validate_json(page_json))
+        pdf_doc.select(range(start, stop))
+        return pdf_doc.tobytes(garbage=1)
+    finally:
+        pdf_doc.close()
+
+
+def _export_workers(pdf_doc, baseline_doc: BaselineDocument) -> int:
+    """Worker processes to use for this export (1 means edit in-process).
+
+    Only plain documents are split: reassembling page ranges keeps pages,
+    annotations, metadata, outline and page labels, and links (those to a
+    page in another range are re-added, see _restore_cross_range_links),
+    but not forms or embedded files.
+    """
+    if len(baseline_doc.pages) < PARALLEL_EXPORT_MIN_PAGES:
+        return 1
+    if pdf_doc.is_form_pdf or pdf_doc.embfile_count():
+        return 1
+    return max(1, min(os.cpu_count() or 1, PARALLEL_EXPORT_MAX_WORKERS, pdf_doc.page_count))
+
+
+def _export_parallel(pdf_doc, original_pdf_bytes: bytes, baseline_doc: BaselineDocument, workers: int) -> bytes:
+    """Edit contiguous page ranges in ``workers`` processes and stitch them back together."""
+    page_count = pdf_doc.page_count
+    bounds = [page_count * i // workers for i in range(workers + 1)]
+    jobs = [[] for _ in range(workers)]
+    for page_data in baseline_doc.pages:
+        if not 0 <= page_data.page_number < page_count:
+            raise ValueError(f"page {page_data.page_number} is not in the document")
+        # Kept in document order, so repeated pages are edited as before
+        jobs[bisect_right(bounds, page_data.page_number) - 1].append(page_data.model_dump_json())
+
+    # spawn, not fork: the caller (Streamlit) is multi-threaded
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+        futures = [
+            executor.submit(_export_page_range, original_pdf_bytes, start, stop, job) if job else None
+            for start, stop, job in zip(bounds, bounds[1:], jobs)
+        ]
+        out_doc = fitz.open()
+        for start, stop, future in zip(bounds, bounds[1:], futures):
+            if future is None:
+                # Nothing edited in this range: copy it straight from the source
+                out_doc.insert_pdf(pdf_doc, from_page=start, to_page=stop - 1)
+                continue
+            with fitz.open(stream=future.result(), filetype="pdf") as part:
+                out_doc.insert_pdf(part)
+
+    _restore_cross_range_links(pdf_doc, out_doc, bounds)
+    out_doc.set_metadata(pdf_doc.metadata)
+    xml_metadata = pdf_doc.get_xml_metadata()
+    if xml_metadata:
+        out_doc.set_xml_metadata(xml_metadata)
+    out_doc.set_toc(pdf_doc.get_toc(simple=False))
+    page_labels = pdf_doc.get_page_labels()
+    if page_labels:
+        out_doc.set_page_labels(page_labels)
+    # garbage=3 merges the resources (fonts, images) each range carried over
+    out_pdf_bytes = out_doc.tobytes(garbage=3, deflate=True)
+    out_doc.close()
+    return out_pdf_bytes
+
+
+def _restore_cross_range_links(pdf_doc, out_doc, bounds: list) -> None:
+    """Re-add internal links whose target page is in another page range.
+
+    Selecting a range drops links to pages outside it, and inserting the
+    ranges back together doesn't restore them; links within a range survive.
+    """
+    for start, stop in zip(bounds, bounds[1:]):
+        for page_num in range(start, stop):
+            out_page = None
+            for link in pdf_doc[page_num].get_links():
+                if link["kind"] not in (fitz.LINK_GOTO, fitz.LINK_NAMED):
+                    continue
+                target = link.get("page", -1)
+                if target < 0 or start <= target < stop:
+                    continue
+                if out_page is None:
+                    out_page = out_doc[page_num]
+                out_page.insert_link({
+                    "kind": fitz.LINK_GOTO,
+                    "from": link["from"],
+                    "page": target,
+                    "to": link.get("to") or fitz.Point(0, 0),
+                    "zoom": link.get("zoom", 0),
+                })
+
+
 def export_edited_pdf(original_pdf_bytes: bytes, baseline_doc: BaselineDocument) -> Optional[bytes]:
     """
     Overlays the edited text from the BaselineDocument onto the original PDF.
@@ -23,49 +194,16 @@ def export_edited_pdf(original_pdf_bytes: bytes, baseline_doc: BaselineDocument)
         # Open the PDF from bytes
         pdf_doc = fitz.open(stream=original_pdf_bytes, filetype="pdf")
         
+        # Large exports are split across processes (see PARALLEL_EXPORT_MIN_PAGES)
+        workers = _export_workers(pdf_doc, baseline_doc)
+        if workers > 1:
+            out_pdf_bytes = _export_parallel(pdf_doc, original_pdf_bytes, baseline_doc, workers)
+            pdf_doc.close()
+            return out_pdf_bytes
+
         # Iterate through the baseline pages
         for page_data in baseline_doc.pages:
-            # fitz pages are 0-indexed, and baseline page_number is 1-indexed (usually) or 0-indexed depending on parsing
-            # Let's assume baseline page_number is 0-indexed based on how we built it, but we can verify.
-            # In our schema it says: page_number: int. Let's assume it maps directly to fitz index.
-            # If our page_number is 1-indexed, we subtract 1.
-            # Let's just use the array index since they should be sequential.
-            fitz_page = pdf_doc.load_page(page_data.page_number)
-            
-            # The coordinates in Marker are usually given in points matching the PDF page size.
-            # Let's verify width/height match roughly to handle scaling if needed.
-            # (In a production app, we would apply a scaling matrix here if Marker's bbox DPI != PDF native DPI).
-            
-            def process_blocks(blocks):
-                for block in blocks:
-                    if block.bbox and len(block.bbox) == 4 and block.content:
-                        # block.bbox is [x0, y0, x1, y1]
-                        rect = fitz.Rect(block.bbox)
-                        
-                        # 1. Erase the old content by drawing a white rectangle
-                        fitz_page.draw_rect(rect, color=(1, 1, 1), fill=(1, 1, 1))
-                        
-                        # 2. Draw the new content
-                        # We try to fit the text in the box. `insert_textbox` handles wrapping.
-                        # For a real premium feel, we could try to detect the original font size,
-                        # but for now we let fitz auto-scale or pick a standard font size that fits.
-                        try:
-                            fitz_page.insert_textbox(
-                                rect, 
-                                block.content, 
-                                fontsize=11, 
-                                fontname="helv", 
-                                color=(0, 0, 0),
-                                align=0 # left align
-                            )
-                        except Exception as e:
-                            logger.error(f"Failed to draw text for block {block.id}: {e}")
-                    
-                    # Recursively process children
-                    if block.children:
-                        process_blocks(block.children)
-            
-            process_blocks(page_data.blocks)
+            _apply_page_edits(pdf_doc, page_data)
             
         # Save the result to a byte buffer
         out_pdf_bytes = pdf_doc.write()
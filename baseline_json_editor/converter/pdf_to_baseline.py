@@ -17,11 +17,14 @@ import logging
 import os
 import re
 import tempfile
-from typing import Any, Dict, List, Optional
+from collections import Counter
+from functools import lru_cache
+from html import unescape
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
-from bs4 import BeautifulSoup
+import orjson
 
 from converter.schema import (
     BaselineBlock,
@@ -32,80 +35,180 @@ from converter.schema import (
 )
 
 
-def extract_text_from_html(html: str) -> str:
-    """Strip HTML tags and return clean text content."""
-    if not html:
-        return ""
-    soup = BeautifulSoup(html, "html.parser")
-    text = soup.get_text(separator=" ", strip=True)
-    text = re.sub(r"\s+", " ", text).strip()
-    return text
+# A tag or comment; group 1 is the tag name (with "/" for end tags) or the
+# "/", "!" or "?" of a bogus tag. As in html.parser, "<" only opens a tag
+# when one of those or a letter follows; quoted attribute values may
+# contain ">".
+_TAG_RE = re.compile(
+    r"<!--.*?-->|<(/?[a-zA-Z][^\s/>\"']*|[/!?])(?:[^>\"']|\"[^\"]*\"|'[^']*')*>", re.S
+)
+_LANGUAGE_RE = re.compile(r'class="language-(\w+)"')
+_HEADING_RE = re.compile(r"<h(\d)")
 
 
-def extract_properties_from_block(block: dict) -> Dict[str, Any]:
-    """Extract formatting / structural properties from a Marker JSON block."""
-    props: Dict[str, Any] = {}
-    block_type = block.get("block_type", "")
+class _BlockKind(NamedTuple):
+    """Which properties a Marker block type carries."""
 
-    if "SectionHeader" in block_type:
-        html = block.get("html", "")
-        level_match = re.search(r"<h(\d)", html)
-        if level_match:
-            props["heading_level"] = int(level_match.group(1))
+    heading: bool
+    table: bool
+    list: bool
+    code: bool
 
-    if "Table" in block_type:
-        html = block.get("html", "")
-        soup = BeautifulSoup(html, "html.parser")
-        rows = soup.find_all("tr")
-        props["row_count"] = len(rows)
-        if rows:
-            cols = rows[0].find_all(["td", "th"])
-            props["column_count"] = len(cols)
-
-    if "ListItem" in block_type or "ListGroup" in block_type:
-        html = block.get("html", "")
-        if "<ol" in html:
-            props["list_type"] = "ordered"
-        else:
-            props["list_type"] = "unordered"
 
-    if "Code" in block_type:
-        html = block.get("html", "")
-        lang_match = re.search(r'class="language-(\w+)"', html)
+# Block type → _BlockKind, filled in as types are first seen (see _block_kind)
+_BLOCK_KINDS: Dict[str, _BlockKind] = {}
+
+
+def _block_kind(block_type: str) -> _BlockKind:
+    """Return the properties ``block_type`` carries, matched once per type.
+
+    Matching is by substring, so Marker's TableCell, TableGroup and
+    TableOfContents get table counts too.
+    """
+    kind = _BLOCK_KINDS.get(block_type)
+    if kind is None:
+        kind = _BLOCK_KINDS[block_type] = _BlockKind(
+            heading="SectionHeader" in block_type,
+            table="Table" in block_type,
+            list="ListItem" in block_type or "ListGroup" in block_type,
+            code="Code" in block_type,
+        )
+    return kind
+
+
+# Marker repeats identical fragments (page headers/footers, empty cells,
+# boilerplate), so parse results are memoized per (html, block_type) for the
+# length of a conversion; see convert_document_to_baseline.
+@lru_cache(maxsize=8192)
+def parse_block_html(html: str, block_type: str = "") -> Tuple[str, Dict[str, Any]]:
+    """Return a Marker block's clean text and its formatting / structural
+    properties, from a single scan over its HTML.
+
+    Marker emits well-formed fragments, so tags are found with a regex rather
+    than a parser. Each tag becomes a space in the text, as BeautifulSoup's
+    get_text(" ", strip=True) joined text nodes, and the tag names found on
+    the way give a table's shape. The heading level, list type and
+    blockquote flag are matched on the raw HTML. Fragments with script or
+    style elements, whose content isn't text, get their text from
+    BeautifulSoup.
+
+    Results are cached and shared between calls: the properties dict must
+    not be mutated.
+    """
+    props: Dict[str, Any] = {}
+    kind = _block_kind(block_type)
+
+    # One C-level scan: the split alternates text runs and tag names (None
+    # for comments), so the text is every other piece. Tag-free fragments
+    # (common for captions, equations and cells) skip the regex.
+    pieces = _TAG_RE.split(html) if "<" in html else [html]
+    if "<script" in html or "<style" in html:
+        # Rare; bs4 takes ~80 ms to import, so only pay for it here
+        from bs4 import BeautifulSoup
+
+        text = BeautifulSoup(html, "html.parser").get_text(separator=" ", strip=True)
+    else:
+        text = " ".join(pieces[::2])
+        if "&" in text:
+            text = unescape(text)
+    text = " ".join(text.split())
+
+    if kind.heading:
+        level_match = _HEADING_RE.search(html)
+        if level_match:
+            props["heading_level"] = int(level_match.group(1))
+    if kind.table:
+        row_count, column_count = _table_shape(html) if "<" in html else (0, 0)
+        props["row_count"] = row_count
+        if row_count:
+            props["column_count"] = column_count
+    if kind.list:
+        props["list_type"] = "ordered" if "<ol" in html else "unordered"
+    if kind.code:
+        lang_match = _LANGUAGE_RE.search(html)
         if lang_match:
             props["language"] = lang_match.group(1)
-
-    if "blockquote" in block.get("html", "").lower():
+    # Anywhere in the fragment, any case (not only as a tag)
+    if "blockquote" in html or "blockquote" in html.lower():
         props["blockquote"] = True
 
-    return props
+    return text, props
 
 
-def marker_block_to_baseline(block: dict, page_num: int) -> BaselineBlock:
-    """Transform a single Marker JSON block into a BaselineBlock."""
+# Elements html.parser (and so BeautifulSoup) never leaves open
+_VOID_TAGS = frozenset((
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "keygen", "link", "menuitem", "meta",
+    "param", "source", "track", "wbr", "basefont", "bgsound", "command", "frame", "image", "isindex",
+    "nextid", "spacer",
+))
+
+
+def _table_shape(html: str) -> Tuple[int, int]:
+    """Count a table fragment's rows and first-row cells.
+
+    Matches BeautifulSoup's find_all("tr") / rows[0].find_all(["td", "th"])
+    under html.parser: every row counts (nested tables' too), and a cell
+    counts while the first row is open. That row stays open until an end
+    tag closes it or an enclosing element, so rows nested in an unclosed
+    first row count, as do the cells of tables nested inside it.
+    """
+    row_count = 0
+    column_count = 0
+    stack: List[str] = []
+    first_row = -1  # stack position of the first row while it's open
+    for match in _TAG_RE.finditer(html):
+        name = match.group(1)
+        if not name or name in ("/", "!", "?"):
+            continue  # comment, declaration or processing instruction
+        name = name.lower()
+        if name[0] == "/":
+            # Closes the innermost open element of that name and everything
+            # inside it; stray end tags are ignored
+            name = name[1:]
+            for i in range(len(stack) - 1, -1, -1):
+                if stack[i] == name:
+                    del stack[i:]
+                    if first_row >= i:
+                        first_row = -1
+                    break
+            continue
+        if name == "tr":
+            row_count += 1
+        elif (name == "td" or name == "th") and first_row >= 0:
+            column_count += 1
+        if name in _VOID_TAGS or match.group(0).endswith("/>"):
+            continue
+        if name == "tr" and row_count == 1:
+            first_row = len(stack)
+        stack.append(name)
+    return row_count, column_count
+
+
+def extract_text_from_html(html: str) -> str:
+    """Strip HTML tags and return clean text content."""
+    return parse_block_html(html)[0]
+
+
+def extract_properties_from_block(block: dict) -> Dict[str, Any]:
+    """Extract formatting / structural properties from a Marker JSON block."""
+    return dict(parse_block_html(block.get("html", ""), block.get("block_type", ""))[1])
+
+
+def _build_block(block: dict, page_num: int, children: List[BaselineBlock]) -> BaselineBlock:
+    """Build one BaselineBlock from its Marker JSON and its converted children."""
     block_type = block.get("block_type", "Unknown")
     html = block.get("html", "")
-    content = extract_text_from_html(html)
-    properties = extract_properties_from_block(block)
+    content, properties = parse_block_html(html, block_type)
     bbox = block.get("bbox", [])
 
     section_hierarchy = block.get("section_hierarchy")
     if section_hierarchy:
         section_hierarchy = {str(k): str(v) for k, v in section_hierarchy.items()}
 
-    children_data = block.get("children", [])
-    children = []
-    if children_data:
-        for child in children_data:
-            children.append(marker_block_to_baseline(child, page_num))
-
-    if children and not content:
-        content = ""
-
     images = block.get("images")
     if images:
-        properties["has_images"] = True
-        properties["image_keys"] = list(images.keys())
+        # Copy: the parsed properties are shared through the cache
+        properties = {**properties, "has_images": True, "image_keys": list(images.keys())}
 
     block_props = BlockProperties(**properties) if properties else None
 
@@ -121,6 +224,27 @@ def marker_block_to_baseline(block: dict, page_num: int) -> BaselineBlock:
     )
 
 
+def marker_block_to_baseline(block: dict, page_num: int) -> BaselineBlock:
+    """Transform a single Marker JSON block (and its subtree) into a BaselineBlock."""
+    # Explicit post-order walk instead of recursion: each entry is a Marker
+    # block, the list its BaselineBlock goes into, and, once its children
+    # have been queued, the list collecting them.
+    result: List[BaselineBlock] = []
+    stack: List[Tuple[dict, List[BaselineBlock], Optional[List[BaselineBlock]]]] = [(block, result, None)]
+    while stack:
+        data, out, children = stack.pop()
+        if children is not None:
+            out.append(_build_block(data, page_num, children))
+            continue
+        children = []
+        stack.append((data, out, children))
+        children_data = data.get("children")
+        if children_data:
+            # Reversed so siblings are converted, and appended, in order
+            stack.extend((child, children, None) for child in reversed(children_data))
+    return result[0]
+
+
 # ────────────────────────────────────────────────────────────
 # Cached model loading (only loaded ONCE per session)
 # ────────────────────────────────────────────────────────────
@@ -171,6 +295,60 @@ def get_cached_converter(
     return converter, config_parser
 
 
+# Marker JSON at least this large is parsed one page at a time with ijson
+# (when installed, see _ijson); below it orjson parses the whole document.
+MARKER_STREAM_MIN_BYTES = 1024 * 1024
+
+# ijson module, resolved on first use (see _ijson); False once it turned out
+# to be unavailable
+_ijson_module = None
+
+
+def _ijson():
+    """Return the ijson module, or None if it isn't installed.
+
+    ijson is optional (the ``stream`` extra); without it the Marker output is
+    always parsed in one go.
+    """
+    global _ijson_module
+    if _ijson_module is None:
+        try:
+            import ijson
+
+            _ijson_module = ijson
+        except ImportError:
+            _ijson_module = False
+    return _ijson_module or None
+
+
+def _load_marker_output(text_json: str) -> Tuple[Iterable[dict], Optional[dict]]:
+    """Parse Marker's JSON output into its pages and its metadata.
+
+    Large outputs are streamed: pages are decoded one at a time as they are
+    consumed, so the dict tree of the whole document never exists at once
+    next to the BaselineBlocks built from it. The metadata, which Marker
+    writes after the pages, is read in a first pass that also surfaces
+    anything the streaming parser rejects (such as NaN) before any page is
+    built; those outputs fall back to a full parse.
+    """
+    ijson = _ijson() if len(text_json) >= MARKER_STREAM_MIN_BYTES else None
+    if ijson is not None:
+        data = text_json.encode()
+        try:
+            metadata = next(ijson.items(data, "metadata", use_float=True), {})
+        except ijson.JSONError:
+            pass
+        else:
+            return ijson.items(data, "children.item", use_float=True), metadata
+
+    try:
+        marker_output = orjson.loads(text_json)
+    except orjson.JSONDecodeError:
+        # orjson rejects the NaN/Infinity constants json.dumps writes
+        marker_output = json.loads(text_json)
+    return marker_output.get("children", []), marker_output.get("metadata", {})
+
+
 def convert_document_to_baseline(
     filepath: str,
     page_range: Optional[str] = None,
@@ -207,27 +385,23 @@ def convert_document_to_baseline(
     logger.info("Conversion finished. Building baseline JSON schema...")
 
     text_json, ext, _ = text_from_rendered(rendered)
-    marker_output = json.loads(text_json)
+    children, metadata = _load_marker_output(text_json)
 
     # Build baseline document
     filename = os.path.basename(filepath)
     title = os.path.splitext(filename)[0].replace("_", " ").replace("-", " ").title()
 
     pages: List[BaselinePage] = []
-    block_type_counts: Dict[str, int] = {}
+    block_type_counts: Counter = Counter()
 
-    children = marker_output.get("children", [])
-    logger.info(f"Parsing {len(children)} pages from Marker JSON output...")
+    logger.info("Parsing pages from Marker JSON output...")
     for page_idx, page_block in enumerate(children):
         page_blocks: List[BaselineBlock] = []
 
         page_children = page_block.get("children", [])
         for block_data in page_children:
-            baseline_block = marker_block_to_baseline(block_data, page_idx)
-            page_blocks.append(baseline_block)
-
-            bt = baseline_block.block_type
-            block_type_counts[bt] = block_type_counts.get(bt, 0) + 1
+            page_blocks.append(marker_block_to_baseline(block_data, page_idx))
+        block_type_counts.update(block.block_type for block in page_blocks)
 
         page_bbox = page_block.get("bbox", [0, 0, 612, 792])
         width = page_bbox[2] - page_bbox[0] if len(page_bbox) >= 4 else 612
@@ -241,9 +415,12 @@ def convert_document_to_baseline(
                 blocks=page_blocks,
             )
         )
+    logger.info(f"Parsed {len(pages)} pages from Marker JSON output.")
+
+    # The memoized fragments are only likely to repeat within a document
+    parse_block_html.cache_clear()
 
     toc = []
-    metadata = marker_output.get("metadata", {})
     if "table_of_contents" in metadata:
         toc = metadata["table_of_contents"]
 
@@ -256,7 +433,7 @@ def convert_document_to_baseline(
         pages=pages,
         metadata=BaselineMetadata(
             total_pages=len(pages),
-            block_type_counts=block_type_counts,
+            block_type_counts=dict(block_type_counts),
             table_of_contents=toc,
         ),
     )
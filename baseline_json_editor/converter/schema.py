@@ -10,7 +10,12 @@ from __future__ import annotations
 
 from typing import Any, Dict, List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
+
+# Shared by the models that carry float geometry: keep inf/nan round-trippable
+# through the JSON SSOT and never re-validate on attribute assignment (the
+# editor assigns ``content`` on every keystroke).
+_GEOMETRY_CONFIG = ConfigDict(ser_json_inf_nan="constants", validate_assignment=False)
 
 
 class BlockProperties(BaseModel):
@@ -32,6 +37,8 @@ class BlockProperties(BaseModel):
 class BaselineBlock(BaseModel):
     """A single document block (paragraph, heading, table, etc.)."""
 
+    model_config = _GEOMETRY_CONFIG
+
     id: str = Field(description="Unique block identifier (e.g. 'page_0/SectionHeader/0')")
     block_type: str = Field(description="Block type from Marker (SectionHeader, Text, Table, etc.)")
     content: str = Field(default="", description="Editable text content of this block")
@@ -57,6 +64,8 @@ class BaselineBlock(BaseModel):
 class BaselinePage(BaseModel):
     """A single page of the document."""
 
+    model_config = _GEOMETRY_CONFIG
+
     page_number: int
     width: float = 0.0
     height: float = 0.0
@@ -75,6 +84,8 @@ class BaselineMetadata(BaseModel):
 class BaselineDocument(BaseModel):
     """Root model for the baseline JSON schema."""
 
+    model_config = _GEOMETRY_CONFIG
+
     title: str = Field(default="Untitled Document", description="Editable document title")
     filename: str = ""
     schema_version: str = "1.0.0"
@@ -23,11 +23,38 @@ BLOCK_TYPE_COLORS = {
     "ComplexRegion": "#FDCB6E",
     "Default": "#636E72",
 }
+_DEFAULT_COLOR = BLOCK_TYPE_COLORS["Default"]
+
+BLOCK_TYPE_ICONS = {
+    "SectionHeader": "📑",
+    "Text": "📝",
+    "Table": "📊",
+    "ListItem": "📋",
+    "ListGroup": "📋",
+    "Code": "💻",
+    "Equation": "🔢",
+    "Figure": "🖼️",
+    "Picture": "🖼️",
+    "Caption": "💬",
+    "Footnote": "📌",
+    "Form": "📝",
+    "Handwriting": "✍️",
+    "TableOfContents": "📖",
+    "Reference": "🔗",
+    "Page": "📄",
+    "ComplexRegion": "🧩",
+}
+_DEFAULT_ICON = "📦"
 
 
 def get_block_color(block_type: str) -> str:
     """Return the hex color for a given block type."""
-    return BLOCK_TYPE_COLORS.get(block_type, BLOCK_TYPE_COLORS["Default"])
+    return BLOCK_TYPE_COLORS.get(block_type, _DEFAULT_COLOR)
+
+
+def get_block_icon(block_type: str) -> str:
+    """Return an emoji icon for a block type."""
+    return BLOCK_TYPE_ICONS.get(block_type, _DEFAULT_ICON)
 
 
 CUSTOM_CSS = """
@@ -448,6 +475,62 @@ def render_property_chips(properties: dict) -> str:
     return " ".join(chips)
 
 
+def render_block_header(block) -> str:
+    """Generate the read-only card header for a top-level block in the schema editor."""
+    color = get_block_color(block.block_type)
+    header_html = (
+        f'<div class="editor-block" style="border-left-color: {color};">'
+        f'<div class="editor-block-header">'
+        f"<div>{render_block_badge(block.block_type)}</div>"
+        f'<div class="block-id-label">{block.id}</div>'
+        f"</div>"
+    )
+
+    # Properties chips
+    if block.properties:
+        props_dict = block.properties.model_dump(exclude_none=True)
+        if props_dict:
+            header_html += f"<div>{render_property_chips(props_dict)}</div>"
+
+    # Section hierarchy
+    if block.section_hierarchy:
+        hierarchy_str = " → ".join(block.section_hierarchy.values())
+        header_html += (
+            f'<div style="font-size:0.72rem; color:#A29BFE; margin-top:4px; margin-bottom:4px;">'
+            f"📂 {hierarchy_str}</div>"
+        )
+
+    # Bbox info
+    if block.bbox:
+        bbox_str = ", ".join(f"{v:.1f}" for v in block.bbox[:4])
+        header_html += f'<div class="block-id-label">📐 bbox: [{bbox_str}]</div>'
+
+    return header_html + "</div>"
+
+
+def render_children_wrapper(block) -> str:
+    """Generate the "n nested block(s)" marker shown above a block's children."""
+    color = get_block_color(block.block_type)
+    return (
+        f'<div style="margin-left:1.5rem; padding-left:1rem; border-left:2px solid {color}30;">'
+        f'<div style="font-size:0.75rem; color:var(--text-muted); margin-bottom:0.4rem;">↳ {len(block.children)} nested block(s)</div>'
+        f"</div>"
+    )
+
+
+def render_child_card(child) -> str:
+    """Generate the compact read-only card for a nested child block."""
+    child_color = get_block_color(child.block_type)
+    return (
+        f'<div style="margin-left:1.5rem; padding:0.5rem 0.75rem; '
+        f"background:rgba(255,255,255,0.02); border-left:2px solid {child_color}40; "
+        f'border-radius:0 6px 6px 0; margin-bottom:0.3rem;">'
+        f"{render_block_badge(child.block_type)} "
+        f'<span class="block-id-label" style="margin-left:8px;">{child.id}</span>'
+        f"</div>"
+    )
+
+
 def render_metric_card(value: str, label: str, color: str = "#A29BFE") -> str:
     """Generate HTML for a single metric card."""
     return (
@@ -0,0 +1,88 @@
+"""
+Tests for the direct DOCX → Baseline conversion.
+"""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+
+docx = pytest.importorskip("docx")
+pytest.importorskip("mammoth")
+
+from converter import docx_to_baseline
+from converter.docx_to_baseline import convert_docx_direct
+
+
+def _summary(block):
+    """Block type, content and (for tables) cell text by row."""
+    if block.block_type == "Table":
+        return block.block_type, block.content, [[c.content for c in row.children] for row in block.children]
+    return block.block_type, block.content, [c.content for c in block.children or []]
+
+
+@pytest.fixture
+def small_docx(tmp_path):
+    document = docx.Document()
+    document.add_heading("Model Inventory", level=1)
+    paragraph = document.add_paragraph("Plain paragraph with ")
+    paragraph.add_run("bold").bold = True
+    paragraph.add_run(" text.")
+    document.add_heading("Owners", level=2)
+    document.add_paragraph("First bullet", style="List Bullet")
+    document.add_paragraph("Second bullet", style="List Bullet")
+    document.add_paragraph("Step one", style="List Number")
+    table = document.add_table(rows=3, cols=2)
+    for r, row in enumerate(table.rows):
+        for c, cell in enumerate(row.cells):
+            cell.text = f"r{r}c{c}"
+    document.add_paragraph("")
+    document.add_paragraph("Closing note.")
+    path = tmp_path / "small.docx"
+    document.save(str(path))
+    return str(path)
+
+
+def test_small_docx_matches_baseline(small_docx):
+    # Expected values are what the BeautifulSoup-based converter produced
+    doc = convert_docx_direct(small_docx)
+    blocks = doc.pages[0].blocks
+
+    assert [_summary(b) for b in blocks] == [
+        ("SectionHeader", "Model Inventory", []),
+        ("Text", "Plain paragraph with bold text.", []),
+        ("SectionHeader", "Owners", []),
+        ("ListGroup", "", ["First bullet", "Second bullet"]),
+        ("ListGroup", "", ["Step one"]),
+        ("Table", "r0c0 r0c1 r1c0 r1c1 r2c0 r2c1", [["r0c0", "r0c1"], ["r1c0", "r1c1"], ["r2c0", "r2c1"]]),
+        ("Text", "Closing note.", []),
+    ]
+    assert [b.id for b in blocks] == [
+        "page_0/SectionHeader/0",
+        "page_0/Text/1",
+        "page_0/SectionHeader/2",
+        "page_0/ListGroup/3",
+        "page_0/ListGroup/4",
+        "page_0/Table/5",
+        "page_0/Text/6",
+    ]
+    assert [b.properties.heading_level for b in (blocks[0], blocks[2])] == [1, 2]
+    assert [b.properties.list_type for b in (blocks[3], blocks[4])] == ["unordered", "ordered"]
+    assert (blocks[5].properties.row_count, blocks[5].properties.column_count) == (3, 2)
+    assert doc.metadata.block_type_counts == {"SectionHeader": 2, "Text": 2, "ListGroup": 2, "Table": 1}
+
+
+def test_bare_text_stays_bare(monkeypatch):
+    # Leading text must not come back wrapped in an implied <p>
+    html = "Lead text<p>Para</p> tail "
+    fake = SimpleNamespace(convert_to_html=lambda f: SimpleNamespace(value=html, messages=[]))
+    monkeypatch.setattr(docx_to_baseline, "_mammoth", lambda: fake)
+
+    doc = convert_docx_direct(__file__, include_html=True)
+
+    assert [(b.id, b.content, b.html) for b in doc.pages[0].blocks] == [
+        ("page_0/Text/0", "Lead text", "Lead text"),
+        ("page_0/Text/1", "Para", "<p>Para</p>"),
+        ("page_0/Text/2", "tail", "tail"),
+    ]
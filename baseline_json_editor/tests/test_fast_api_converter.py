@@ -0,0 +1,46 @@
+"""
+Tests for the Vision API converter's request plumbing (no network).
+"""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+
+openai = pytest.importorskip("openai")
+httpx = pytest.importorskip("httpx")
+
+from converter.fast_api_converter import _is_rate_limited, _openai_response_format
+from converter.schema import BaselinePage
+
+
+def _rate_limit_error(code: str):
+    response = httpx.Response(429, request=httpx.Request("POST", "https://api.openai.com/v1/chat/completions"))
+    return openai.RateLimitError("429", response=response, body={"code": code, "type": "requests"})
+
+
+def test_response_format_matches_sdk_parse():
+    """The cached envelope is exactly what ``parse(response_format=BaselinePage)`` sends."""
+    sent = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        sent.append(json.loads(request.content))
+        return httpx.Response(400, json={"error": {"message": "stop", "type": "invalid_request_error"}})
+
+    http_client = httpx.Client(transport=httpx.MockTransport(handler))
+    client = openai.OpenAI(api_key="test", max_retries=0, http_client=http_client)
+    completions = client.chat.completions if hasattr(client.chat.completions, "parse") else client.beta.chat.completions
+    with pytest.raises(openai.BadRequestError):
+        completions.parse(
+            model="gpt-4o-mini",
+            messages=[{"role": "user", "content": "hi"}],
+            response_format=BaselinePage,
+        )
+
+    assert sent[0]["response_format"] == _openai_response_format()
+
+
+def test_spent_quota_is_not_retried():
+    assert _is_rate_limited(_rate_limit_error("rate_limit_exceeded"))
+    assert not _is_rate_limited(_rate_limit_error("insufficient_quota"))
@@ -0,0 +1,70 @@
+"""
+Tests for exporting edited PDFs (serial and parallel paths).
+"""
+
+from __future__ import annotations
+
+import pytest
+
+fitz = pytest.importorskip("fitz")
+
+from converter import pdf_exporter
+from converter.schema import BaselineBlock, BaselineDocument, BaselinePage
+
+PAGE_COUNT = 70
+
+
+def _source_pdf() -> bytes:
+    doc = fitz.open()
+    for i in range(PAGE_COUNT):
+        page = doc.new_page()
+        page.insert_text((72, 72), f"Original text on page {i}")
+    # Links across the parallel page ranges and within one range
+    link_rect = fitz.Rect(72, 100, 200, 120)
+    for source, target in ((0, 60), (5, 6), (45, 1)):
+        doc[source].insert_link({"kind": fitz.LINK_GOTO, "from": link_rect, "page": target, "to": fitz.Point(0, 0)})
+    doc[40].insert_link({"kind": fitz.LINK_URI, "from": link_rect, "uri": "https://example.com/"})
+    doc.set_toc([[1, "Start", 1], [2, "Middle", 36], [1, "End", 70]])
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def _baseline(edit_every: int) -> BaselineDocument:
+    pages = []
+    for i in range(PAGE_COUNT):
+        blocks = []
+        if i % edit_every == 0:
+            blocks.append(BaselineBlock(
+                id=f"page_{i}/Text/0", block_type="Text", content=f"Edited page {i}", bbox=[60, 55, 400, 80],
+            ))
+        pages.append(BaselinePage(page_number=i, width=612, height=792, blocks=blocks))
+    return BaselineDocument(pages=pages)
+
+
+def _summary(pdf_bytes: bytes):
+    with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+        links = [
+            [
+                (link["kind"], tuple(round(v, 1) for v in link["from"]), link.get("page"), link.get("uri"))
+                for link in page.get_links()
+            ]
+            for page in doc
+        ]
+        return links, doc.get_toc(), [page.get_text() for page in doc]
+
+
+# Every 10th page edited, or only page 0 (later ranges are copied unedited)
+@pytest.mark.parametrize("edit_every", [10, PAGE_COUNT])
+def test_parallel_export_matches_serial(monkeypatch, edit_every):
+    source, baseline = _source_pdf(), _baseline(edit_every)
+
+    monkeypatch.setattr(pdf_exporter, "_export_workers", lambda pdf_doc, baseline_doc: 1)
+    serial = pdf_exporter.export_edited_pdf(source, baseline)
+    monkeypatch.setattr(pdf_exporter, "_export_workers", lambda pdf_doc, baseline_doc: 4)
+    parallel = pdf_exporter.export_edited_pdf(source, baseline)
+
+    assert serial is not None and parallel is not None
+    serial_summary = _summary(serial)
+    assert serial_summary[0][0] and serial_summary[0][5] and serial_summary[0][45]
+    assert _summary(parallel) == serial_summary
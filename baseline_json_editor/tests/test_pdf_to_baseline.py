@@ -0,0 +1,75 @@
+"""
+Tests for turning Marker block HTML into text and properties.
+"""
+
+from __future__ import annotations
+
+import re
+
+import pytest
+
+bs4 = pytest.importorskip("bs4")
+
+from converter.pdf_to_baseline import parse_block_html
+
+
+def _bs4_text(html: str) -> str:
+    """Block text as the BeautifulSoup-based converter extracted it."""
+    if not html:
+        return ""
+    text = bs4.BeautifulSoup(html, "html.parser").get_text(separator=" ", strip=True)
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def _bs4_props(html: str, block_type: str) -> dict:
+    """Block properties as the BeautifulSoup-based converter extracted them."""
+    props = {}
+    if "SectionHeader" in block_type:
+        level_match = re.search(r"<h(\d)", html)
+        if level_match:
+            props["heading_level"] = int(level_match.group(1))
+    if "Table" in block_type:
+        rows = bs4.BeautifulSoup(html, "html.parser").find_all("tr")
+        props["row_count"] = len(rows)
+        if rows:
+            props["column_count"] = len(rows[0].find_all(["td", "th"]))
+    if "ListItem" in block_type or "ListGroup" in block_type:
+        props["list_type"] = "ordered" if "<ol" in html else "unordered"
+    if "Code" in block_type:
+        lang_match = re.search(r'class="language-(\w+)"', html)
+        if lang_match:
+            props["language"] = lang_match.group(1)
+    if "blockquote" in html.lower():
+        props["blockquote"] = True
+    return props
+
+
+CASES = [
+    ("SectionHeader", "<h2>Intro <b>to</b> things</h2>"),
+    ("SectionHeader", "<H3>Upper-case heading</H3>"),
+    ("SectionHeader", "<p>No heading tag &amp; an entity</p>"),
+    ("ListGroup", "<ol><li>one</li><li>two</li></ol>"),
+    ("ListGroup", "<OL><LI>upper</LI></OL>"),
+    ("ListItem", "<ul><li>bullet <i>item</i></li></ul>"),
+    ("Table", "<table><tr><th>A</th><th>B</th></tr><tr><td>1</td><td>2</td></tr></table>"),
+    ("Table", "<TABLE><TR><TD>a</TD><TD>b</TD><TD>c</TD></TR><TR><TD>d</TD></TR></TABLE>"),
+    ("Table", "<table><tr><td>a<td>b<tr><td>c</table>"),
+    ("Table", "<table><tr><td><table><tr><td>x</td><td>y</td></tr><tr><td>z</td></tr></table></td>"
+              "<td>c</td></tr><tr><td>d</td></tr></table>"),
+    ("Table", "<ol><table><tr></ol><td>a</td><tr><td>b<br><td/></table><TD></table><th>c"),
+    ("TableCell", "<td>cell</td>"),
+    ("Text", "<blockquote><p>Quoted</p></blockquote>"),
+    ("Text", "<BLOCKQUOTE>Upper quote</BLOCKQUOTE>"),
+    ("Text", "<p>The word blockquote in text</p>"),
+    ("Code", '<pre><code class="language-python">print(1)</code></pre>'),
+    ("Text", "<p>a<!-- note -->b</p><br/>c"),
+    ("Text", "plain text, no tags"),
+    ("Text", ""),
+]
+
+
+@pytest.mark.parametrize("block_type,html", CASES)
+def test_matches_beautifulsoup(block_type, html):
+    text, props = parse_block_html(html, block_type)
+    assert text == _bs4_text(html)
+    assert props == _bs4_props(html, block_type)
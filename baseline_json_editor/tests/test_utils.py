@@ -0,0 +1,32 @@
+"""
+Tests for the editor helpers in utils.
+"""
+
+from __future__ import annotations
+
+import pytest
+
+pytest.importorskip("streamlit")
+
+from converter.schema import BaselineBlock, BaselineDocument, BaselinePage
+from styles import get_block_icon, render_block_header, render_child_card
+from utils import build_block_chrome
+
+
+def test_block_chrome_with_duplicate_ids():
+    """Blocks sharing an id still render from themselves, not the first one."""
+    child_a = BaselineBlock(id="dup/child", block_type="ListItem", content="a")
+    child_b = BaselineBlock(id="dup/child", block_type="Code", content="b")
+    header = BaselineBlock(id="dup", block_type="SectionHeader", content="Title", bbox=[1, 2, 3, 4])
+    table = BaselineBlock(id="dup", block_type="Table", content="Cells", bbox=[5, 6, 7, 8], children=[child_a, child_b])
+    doc = BaselineDocument(pages=[BaselinePage(page_number=0, blocks=[header, table])])
+
+    (page_chrome,) = build_block_chrome(doc)
+
+    assert [c.icon for c in page_chrome] == [get_block_icon("SectionHeader"), get_block_icon("Table")]
+    assert page_chrome[0].html == render_block_header(header)
+    assert page_chrome[1].html == render_block_header(table)
+    assert page_chrome[0].html != page_chrome[1].html
+    assert page_chrome[0].children == ()
+    assert [c.html for c in page_chrome[1].children] == [render_child_card(child_a), render_child_card(child_b)]
+    assert page_chrome[1].children[0].icon != page_chrome[1].children[1].icon
@@ -0,0 +1,85 @@
+"""
+Tests for the Vision API converter's on-disk page cache.
+"""
+
+from __future__ import annotations
+
+import os
+import stat
+import time
+
+import pytest
+from PIL import Image
+
+from converter import fast_api_converter
+from converter.fast_api_converter import _cache_get, _cache_key, _cache_prune, _cache_put
+from converter.schema import BaselineBlock, BaselinePage
+
+
+def _page(text: str = "cached") -> BaselinePage:
+    return BaselinePage(page_number=1, blocks=[BaselineBlock(id="page_0/Text/0", block_type="Text", content=text)])
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    path = tmp_path / "vision"
+    monkeypatch.setattr(fast_api_converter, "VISION_CACHE_DIR", str(path))
+    return path
+
+
+def test_miss(cache_dir):
+    assert _cache_get(_cache_key("model", "page", 0, b"image")) is None
+
+
+def test_hit(cache_dir):
+    key = _cache_key("model", "page", 0, b"image")
+    _cache_put(key, _page())
+    assert _cache_get(key) == _page()
+    assert _cache_get(_cache_key("model", "page", 0, b"other image")) is None
+    # Private to the user
+    assert stat.S_IMODE(os.stat(cache_dir).st_mode) == 0o700
+    assert stat.S_IMODE(os.stat(cache_dir / f"{key}.json").st_mode) == 0o600
+
+
+def test_disabled(tmp_path, monkeypatch):
+    monkeypatch.setattr(fast_api_converter, "VISION_CACHE_DIR", "")
+    _cache_put("key", _page())
+    assert _cache_get("key") is None
+    assert not os.listdir(tmp_path)
+
+
+def test_expired_and_oversized_entries(cache_dir, monkeypatch):
+    _cache_put("old", _page("old"))
+    _cache_put("new", _page("new"))
+    _cache_put("newest", _page("newest"))
+    now = time.time()
+    for name, mtime in (("old", 0), ("new", now - 60), ("newest", now)):
+        os.utime(cache_dir / f"{name}.json", (mtime, mtime))
+    assert _cache_get("old") is None
+
+    monkeypatch.setattr(fast_api_converter, "VISION_CACHE_MAX_BYTES", os.path.getsize(cache_dir / "newest.json"))
+    _cache_prune()
+    assert sorted(os.listdir(cache_dir)) == ["newest.json"]
+
+
+def test_convert_bypasses_cache(cache_dir, tmp_path, monkeypatch):
+    image_path = tmp_path / "page.png"
+    Image.new("RGB", (40, 30), "white").save(image_path)
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    calls = []
+
+    def extract(image_b64, page_num, n=1):
+        calls.append(page_num)
+        return _page(f"call {len(calls)}")
+
+    monkeypatch.setattr(fast_api_converter, "extract_page_openai", extract)
+
+    def convert(**kwargs):
+        doc = fast_api_converter.convert_document_fast_api(str(image_path), **kwargs)
+        return doc.pages[0].blocks[0].content
+
+    assert convert() == "call 1"
+    assert convert() == "call 1"  # hit
+    assert convert(use_cache=False) == "call 2"  # bypassed, and stored
+    assert convert() == "call 2"
+    assert len(calls) == 2
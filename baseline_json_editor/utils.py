@@ -6,13 +6,46 @@ Page rendering, serialization helpers, etc.
 from __future__ import annotations
 
 import io
-from typing import Any, Dict, List
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
 
 import pypdfium2
 from PIL import Image
 from streamlit.runtime.uploaded_file_manager import UploadedFile
 
 from converter.schema import BaselineBlock, BaselineDocument
+from styles import (
+    get_block_icon,
+    render_block_header,
+    render_child_card,
+    render_children_wrapper,
+)
+
+# PDFium keeps global state; background preview renders serialize on this lock.
+_PDFIUM_LOCK = threading.Lock()
+
+# Open PDFium documents by upload hash, least recently used first (see
+# _cached_pdf). Only touched under _PDFIUM_LOCK.
+PDF_DOC_CACHE_SIZE = 2
+_pdf_docs: "OrderedDict[str, pypdfium2.PdfDocument]" = OrderedDict()
+
+
+def _cached_pdf(file_bytes: bytes, file_hash: str) -> pypdfium2.PdfDocument:
+    """Return the open document for ``file_hash``, opening it on first use.
+
+    Reopening re-parses the cross-reference table and page tree on every
+    preview render. Documents past PDF_DOC_CACHE_SIZE are closed. The caller
+    must hold _PDFIUM_LOCK.
+    """
+    doc = _pdf_docs.pop(file_hash, None)
+    if doc is None:
+        doc = pypdfium2.PdfDocument(file_bytes)
+    _pdf_docs[file_hash] = doc
+    while len(_pdf_docs) > PDF_DOC_CACHE_SIZE:
+        _pdf_docs.popitem(last=False)[1].close()
+    return doc
 
 
 def open_pdf(pdf_file: UploadedFile):
@@ -23,46 +56,200 @@ def open_pdf(pdf_file: UploadedFile):
 
 def get_page_image(pdf_file: UploadedFile, page_num: int, dpi: int = 96) -> Optional[Image.Image]:
     """Render a page from an uploaded file as a PIL Image."""
-    if pdf_file.type and "pdf" in pdf_file.type:
-        doc = open_pdf(pdf_file)
-        page = doc[page_num]
-        img = page.render(scale=dpi / 72).to_pil().convert("RGB")
-        return img
-    elif pdf_file.type and ("image/" in pdf_file.type):
-        return Image.open(pdf_file).convert("RGB")
+    return render_page_image(pdf_file.getvalue(), pdf_file.type, page_num, dpi)
+
+
+def render_page_image(
+    file_bytes: bytes,
+    file_type: Optional[str],
+    page_num: int,
+    dpi: int = 96,
+    max_width_px: Optional[int] = None,
+    file_hash: Optional[str] = None,
+) -> Optional[Image.Image]:
+    """Render a page from raw file bytes as a PIL Image.
+
+    If ``max_width_px`` is given the page is rasterized to exactly that width
+    (and images are downscaled to it) instead of using ``dpi``; the browser
+    scales the result to the column, so anything wider is wasted work.
+
+    With ``file_hash`` (a content hash of ``file_bytes``) a PDF stays open
+    between calls instead of being reopened for every page.
+
+    Safe to call from a background thread: it does not touch Streamlit, and
+    PDFium (which is not thread-safe) is only entered under a process-wide lock.
+    """
+    if file_type and "pdf" in file_type:
+        with _PDFIUM_LOCK:
+            doc = _cached_pdf(file_bytes, file_hash) if file_hash else pypdfium2.PdfDocument(file_bytes)
+            try:
+                page = doc[page_num]
+                try:
+                    scale = max_width_px / page.get_width() if max_width_px else dpi / 72
+                    return page.render(scale=scale).to_pil().convert("RGB")
+                finally:
+                    page.close()
+            finally:
+                if not file_hash:
+                    doc.close()
+    elif file_type and ("image/" in file_type):
+        img = Image.open(io.BytesIO(file_bytes))
+        if max_width_px and img.width > max_width_px:
+            img.thumbnail((max_width_px, img.height))
+        return img.convert("RGB")
     return None
 
 
+# JPEG quality of preview pages sent to the browser
+PREVIEW_JPEG_QUALITY = 90
+
+
+def render_page_jpeg(
+    file_bytes: bytes,
+    file_type: Optional[str],
+    page_num: int,
+    max_width_px: Optional[int] = None,
+    file_hash: Optional[str] = None,
+) -> Optional[bytes]:
+    """Render a page (see render_page_image) and encode it as JPEG bytes.
+
+    st.image re-encodes a PIL image on every rerun, at quality 100; JPEG
+    bytes are passed through as-is, so a cached page is encoded only once.
+    """
+    image = render_page_image(file_bytes, file_type, page_num, max_width_px=max_width_px, file_hash=file_hash)
+    if image is None:
+        return None
+    with io.BytesIO() as buffered:
+        image.save(buffered, format="JPEG", quality=PREVIEW_JPEG_QUALITY)
+        return buffered.getvalue()
+
+
 def get_page_count(pdf_file: UploadedFile) -> int:
     """Return the number of pages in the uploaded file."""
-    if pdf_file.type and "pdf" in pdf_file.type:
+    return count_pages(pdf_file.getvalue(), pdf_file.type)
+
+
+def count_pages(file_bytes: bytes, file_type: Optional[str], file_hash: Optional[str] = None) -> int:
+    """Return the number of pages in a file given its raw bytes.
+
+    With ``file_hash`` the PDF is left open for later renders (see render_page_image).
+    """
+    if file_type and "pdf" in file_type:
         try:
-            doc = open_pdf(pdf_file)
-            return len(doc)
+            with _PDFIUM_LOCK:
+                if file_hash:
+                    return len(_cached_pdf(file_bytes, file_hash))
+                doc = pypdfium2.PdfDocument(file_bytes)
+                try:
+                    return len(doc)
+                finally:
+                    doc.close()
         except Exception:
             return 1
     return 1
 
 
-def flatten_blocks(blocks: List[BaselineBlock]) -> List[BaselineBlock]:
-    """Flatten a nested block tree into a flat list (depth-first)."""
-    flat = []
-    for block in blocks:
-        flat.append(block)
+def iter_blocks(blocks: List[BaselineBlock]) -> Iterator[BaselineBlock]:
+    """Yield every block of a nested block tree (depth-first, pre-order)."""
+    # Explicit stack instead of recursion; push in reverse to keep document order
+    stack = list(reversed(blocks))
+    while stack:
+        block = stack.pop()
+        yield block
         if block.children:
-            flat.extend(flatten_blocks(block.children))
-    return flat
+            stack.extend(reversed(block.children))
+
+
+def flatten_blocks(blocks: List[BaselineBlock]) -> List[BaselineBlock]:
+    """Flatten a nested block tree into a flat list (depth-first, pre-order)."""
+    return list(iter_blocks(blocks))
+
+
+def build_block_index(doc: BaselineDocument) -> Dict[str, BaselineBlock]:
+    """Map every block id (including nested children) to its block object.
+
+    The first occurrence wins if an id is duplicated, matching the order in
+    which the editor walks the tree.
+    """
+    index: Dict[str, BaselineBlock] = {}
+    for page in doc.pages:
+        for block in iter_blocks(page.blocks):
+            index.setdefault(block.id, block)
+    return index
+
+
+class BlockChrome(NamedTuple):
+    """Precomputed read-only editor HTML for one block.
+
+    ``html`` is the card header for top-level blocks and the compact card for
+    nested children; ``children_html`` is the nested-block marker and
+    ``children`` the children's chrome, in order (top-level blocks with
+    children only).
+    """
+
+    icon: str
+    html: str
+    children_html: str = ""
+    children: Tuple["BlockChrome", ...] = ()
+
+
+def build_block_chrome(doc: BaselineDocument) -> List[List[BlockChrome]]:
+    """Render the schema editor's read-only HTML once per document.
+
+    Everything here depends only on structure (type, id, properties,
+    hierarchy, bbox), which editing never changes, so the editor loop can
+    interpolate these strings instead of rebuilding them on every rerun.
+    The result parallels ``doc.pages[i].blocks`` (block ids need not be
+    unique, so blocks are matched by position).
+    """
+    return [
+        [
+            BlockChrome(
+                get_block_icon(block.block_type),
+                render_block_header(block),
+                render_children_wrapper(block) if block.children else "",
+                tuple(
+                    BlockChrome(get_block_icon(child.block_type), render_child_card(child))
+                    for child in block.children
+                ),
+            )
+            for block in page.blocks
+        ]
+        for page in doc.pages
+    ]
 
 
 def count_editable_fields(doc: BaselineDocument) -> int:
     """Count total editable content fields in the document."""
-    count = 0
+    return sum(1 for page in doc.pages for block in iter_blocks(page.blocks) if block.content)
+
+
+@dataclass
+class DocStats:
+    """Metrics-row numbers, kept alongside the document and updated on edits."""
+
+    total_blocks: int
+    editable_fields: int
+    block_types: int
+
+
+def document_stats(doc: BaselineDocument) -> DocStats:
+    """Compute the metrics-row numbers for a freshly loaded document.
+
+    Block totals come from the converter metadata; editable fields are counted
+    in a single walk over every page's block tree.
+    """
+    counts = doc.metadata.block_type_counts
+    editable = 0
     for page in doc.pages:
-        all_blocks = flatten_blocks(page.blocks)
-        for block in all_blocks:
+        stack = list(page.blocks)
+        while stack:
+            block = stack.pop()
             if block.content:
-                count += 1
-    return count
+                editable += 1
+            if block.children:
+                stack.extend(block.children)
+    return DocStats(total_blocks=sum(counts.values()), editable_fields=editable, block_types=len(counts))
 
 
 def apply_content_edits(doc_dict: dict, edits: Dict[str, str]) -> dict:
@@ -74,17 +261,16 @@ def apply_content_edits(doc_dict: dict, edits: Dict[str, str]) -> dict:
     if not edits:
         return doc_dict
 
-    def _apply_to_blocks(blocks: List[dict]):
-        for block in blocks:
+    for page in doc_dict.get("pages", []):
+        stack = list(page.get("blocks", []))
+        while stack:
+            block = stack.pop()
             block_id = block.get("id", "")
             if block_id in edits:
                 block["content"] = edits[block_id]
             children = block.get("children", [])
             if children:
-                _apply_to_blocks(children)
-
-    for page in doc_dict.get("pages", []):
-        _apply_to_blocks(page.get("blocks", []))
+                stack.extend(children)
 
     # Also apply title edit
     if "__title__" in edits:
@@ -94,64 +280,51 @@ def apply_content_edits(doc_dict: dict, edits: Dict[str, str]) -> dict:
 
 def clear_document_content(doc: BaselineDocument) -> BaselineDocument:
     """
-    Returns a deep copy of the BaselineDocument with all text content explicitly
+    Returns a copy of the BaselineDocument with all text content explicitly
     wiped to empty strings, leaving only the structural schema and formatting properties.
+
+    Pages and blocks are new objects, but each block's properties, bbox and
+    section hierarchy are shared with ``doc``: structure is never edited, so
+    deep-copying it would only copy every leaf of the tree.
     """
-    # Create a deep copy using Pydantic's serialization
-    import json
-    empty_doc = BaselineDocument.model_validate_json(doc.model_dump_json())
-    empty_doc.title = ""
-    
-    def _clear_blocks(blocks: List[BaselineBlock]):
-        for block in blocks:
-            block.content = ""
+    empty_doc = doc.model_copy(update={"title": "", "metadata": doc.metadata.model_copy(deep=True)})
+    empty_doc.pages = [page.model_copy(update={"blocks": list(page.blocks)}) for page in doc.pages]
+
+    # Top-down: each copied block gets a fresh children list, filled in when
+    # that list is popped
+    stack = [page.blocks for page in empty_doc.pages]
+    while stack:
+        blocks = stack.pop()
+        for i, block in enumerate(blocks):
+            block = blocks[i] = block.model_copy(update={"content": ""})
             if block.children:
-                _clear_blocks(block.children)
-                
-    for page in empty_doc.pages:
-        _clear_blocks(page.blocks)
-        
+                block.children = list(block.children)
+                stack.append(block.children)
+
     return empty_doc
 
 
 def build_export_json(doc: BaselineDocument, edits: Dict[str, str]) -> dict:
     """Build the final JSON dict for export, with edits applied."""
     doc_dict = doc.model_dump()
-    doc_dict = apply_content_edits(doc_dict, edits)
 
-    # Remove raw HTML from export to keep it clean
-    def _strip_html(blocks: List[dict]):
-        for block in blocks:
+    # One walk applies the edits and removes raw HTML from the export to
+    # keep it clean (see apply_content_edits)
+    for page in doc_dict.get("pages", []):
+        stack = list(page.get("blocks", []))
+        while stack:
+            block = stack.pop()
             block.pop("html", None)
+            if edits:
+                block_id = block.get("id", "")
+                if block_id in edits:
+                    block["content"] = edits[block_id]
             children = block.get("children", [])
             if children:
-                _strip_html(children)
+                stack.extend(children)
 
-    for page in doc_dict.get("pages", []):
-        _strip_html(page.get("blocks", []))
+    if "__title__" in edits:
+        doc_dict["title"] = edits["__title__"]
 
     return doc_dict
 
-
-def get_block_icon(block_type: str) -> str:
-    """Return an emoji icon for a block type."""
-    icons = {
-        "SectionHeader": "📑",
-        "Text": "📝",
-        "Table": "📊",
-        "ListItem": "📋",
-        "ListGroup": "📋",
-        "Code": "💻",
-        "Equation": "🔢",
-        "Figure": "🖼️",
-        "Picture": "🖼️",
-        "Caption": "💬",
-        "Footnote": "📌",
-        "Form": "📝",
-        "Handwriting": "✍️",
-        "TableOfContents": "📖",
-        "Reference": "🔗",
-        "Page": "📄",
-        "ComplexRegion": "🧩",
-    }
-    return icons.get(block_type, "📦")
@@ -29,6 +29,7 @@ def main():
     parser.add_argument("-o", "--output", default=None, help="Output JSON path (default: stdout)")
     parser.add_argument("--no-vision", action="store_true", help="Skip Vision API (geometry/style + heuristics only)")
     parser.add_argument("--pages", default=None, help="Page range, e.g. '1,3-5,10' (PDF only)")
+    parser.add_argument("--workers", type=int, default=1, help="Processes for PDF char extraction (default: 1)")
     parser.add_argument("--indent", type=int, default=2, help="JSON indent level (default: 2)")
     parser.add_argument("-v", "--verbose", action="store_true", help="Enable debug logging")
 
@@ -56,6 +57,7 @@ def main():
         use_vision=not args.no_vision,
         page_range=args.pages,
         progress_callback=progress,
+        workers=args.workers,
     )
 
     # Serialize with aliases (from → from_id)
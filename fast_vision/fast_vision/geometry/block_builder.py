@@ -10,9 +10,12 @@ Lines are merged when:
 from __future__ import annotations
 
 import logging
+import re
 import uuid
 from typing import Any, Dict, List
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
 # Maximum gap between lines (as multiple of font size) to still merge
@@ -32,33 +35,34 @@ def build_blocks(lines: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     if not lines:
         return []
 
-    # Sort top-to-bottom by y0
-    sorted_lines = sorted(lines, key=lambda ln: ln["y0"])
-
-    blocks: List[List[Dict[str, Any]]] = []
-    current_block: List[Dict[str, Any]] = [sorted_lines[0]]
-
-    for ln in sorted_lines[1:]:
-        prev = current_block[-1]
-
-        # Vertical gap
-        gap = ln["y0"] - prev["y1"]
-        threshold = max(prev["size"] * LINE_GAP_FACTOR, 4.0)
-
-        # Horizontal alignment check
-        x_shift = abs(ln["x0"] - prev["x0"])
-
-        # Font consistency
-        same_font = _font_family(ln["fontname"]) == _font_family(prev["fontname"])
-
-        if gap <= threshold and x_shift <= X_SHIFT_TOLERANCE and same_font:
-            current_block.append(ln)
-        else:
-            blocks.append(current_block)
-            current_block = [ln]
-
-    if current_block:
-        blocks.append(current_block)
+    n = len(lines)
+    y0 = np.fromiter((ln["y0"] for ln in lines), dtype=np.float64, count=n)
+
+    # Sort top-to-bottom by y0 (stable, like sorted())
+    order = np.argsort(y0, kind="stable")
+    sorted_lines = [lines[i] for i in order.tolist()]
+    y0 = y0[order]
+    y1 = np.fromiter((ln["y1"] for ln in sorted_lines), dtype=np.float64, count=n)
+    x0 = np.fromiter((ln["x0"] for ln in sorted_lines), dtype=np.float64, count=n)
+    size = np.fromiter((ln["size"] for ln in sorted_lines), dtype=np.float64, count=n)
+
+    # Font families as small ints, so the consistency check is an array compare
+    family_ids: Dict[str, int] = {}
+    family = np.fromiter(
+        (family_ids.setdefault(_font_family(ln["fontname"]), len(family_ids)) for ln in sorted_lines),
+        dtype=np.int32,
+        count=n,
+    )
+
+    # Each line is compared with the one above it: start a new block where
+    # any of the gap, alignment or font checks fails
+    breaks = ~(
+        (y0[1:] - y1[:-1] <= np.maximum(size[:-1] * LINE_GAP_FACTOR, 4.0))  # vertical gap
+        & (np.abs(x0[1:] - x0[:-1]) <= X_SHIFT_TOLERANCE)  # horizontal alignment
+        & (family[1:] == family[:-1])  # font consistency
+    )
+    bounds = [0, *(np.flatnonzero(breaks) + 1).tolist(), n]
+    blocks = [sorted_lines[start:end] for start, end in zip(bounds, bounds[1:])]
 
     result: List[Dict[str, Any]] = []
     for block_lines in blocks:
@@ -70,43 +74,57 @@ def build_blocks(lines: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
 
 def _merge_lines(lines: List[Dict[str, Any]]) -> Dict[str, Any]:
     """Merge a group of lines into a block dict."""
-    text = "\n".join(ln["text"] for ln in lines)
-
-    # Collect all words from all lines
-    all_words = []
-    for ln in lines:
-        all_words.extend(ln.get("words", []))
-
-    # Dominant font for the block
+    # One pass for the text, words, bbox, dominant font and average size
+    first = lines[0]
+    x0, y0, x1, y1 = first["x0"], first["y0"], first["x1"], first["y1"]
+    texts: List[str] = []
+    all_words: List[Dict[str, Any]] = []
     font_counts: Dict[str, int] = {}
     size_sum = 0.0
     for ln in lines:
+        texts.append(ln["text"])
+        all_words.extend(ln.get("words", []))
         fn = ln["fontname"]
         font_counts[fn] = font_counts.get(fn, 0) + 1
         size_sum += ln["size"]
+        if ln["x0"] < x0:
+            x0 = ln["x0"]
+        if ln["y0"] < y0:
+            y0 = ln["y0"]
+        if ln["x1"] > x1:
+            x1 = ln["x1"]
+        if ln["y1"] > y1:
+            y1 = ln["y1"]
 
     dominant_font = max(font_counts, key=font_counts.get)  # type: ignore
     avg_size = round(size_sum / len(lines), 2)
 
     return {
         "id": str(uuid.uuid4()),
-        "text": text,
-        "x0": min(ln["x0"] for ln in lines),
-        "y0": min(ln["y0"] for ln in lines),
-        "x1": max(ln["x1"] for ln in lines),
-        "y1": max(ln["y1"] for ln in lines),
+        "text": "\n".join(texts),
+        "x0": x0,
+        "y0": y0,
+        "x1": x1,
+        "y1": y1,
         "fontname": dominant_font,
         "size": avg_size,
-        "color": lines[0]["color"],
+        "color": first["color"],
         "lines": lines,
         "words": all_words,
     }
 
 
+# Earliest style suffix or subset-tag "+" in a fontname; everything from
+# there on is dropped by _font_family
+_FAMILY_SUFFIX_RE = re.compile(r"-Bold|-Italic|,Bold|,Italic|-Regular|,Regular|\+")
+
+# fontname -> family; a document only uses a few dozen fontnames
+_FAMILY_CACHE: Dict[str, str] = {}
+
+
 def _font_family(fontname: str) -> str:
     """Normalise font name to family (strip Bold/Italic suffixes)."""
-    name = fontname
-    for suffix in ("-Bold", "-Italic", "-BoldItalic", ",Bold", ",Italic",
-                    "-Regular", ",Regular", "+"):
-        name = name.split(suffix)[0]
-    return name.strip()
+    family = _FAMILY_CACHE.get(fontname)
+    if family is None:
+        family = _FAMILY_CACHE[fontname] = _FAMILY_SUFFIX_RE.split(fontname, 1)[0].strip()
+    return family
@@ -1,23 +1,36 @@
 """
 Extract raw character data from every page of a PDF using pdfplumber.
 
-Each character dict includes:
-  text, x0, y0, x1, y1, fontname, size, stroking_color, non_stroking_color
+Each page's chars are stored as columns (see CHAR_COLUMNS) rather than a dict
+per character:
+  text, x0, y0, x1, y1, fontname, size, color
 """
 
 from __future__ import annotations
 
 import logging
-from typing import Any, Dict, List
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Optional
 
+import numpy as np
 import pdfplumber
 
 logger = logging.getLogger(__name__)
 
+# Per-page char columns: coordinates and sizes are float64 arrays, the rest
+# are lists (one entry per char, in pdfplumber order)
+NUMERIC_CHAR_COLUMNS = ("x0", "y0", "x1", "y1", "size")
+CHAR_COLUMNS = ("text", "x0", "y0", "x1", "y1", "fontname", "size", "color")
 
-def extract_chars_from_pdf(pdf_path: str) -> List[Dict[str, Any]]:
+
+def extract_chars_from_pdf(pdf_path: str, workers: int = 1) -> List[Dict[str, Any]]:
     """Return a list of page dicts, each containing raw chars and dimensions.
 
+    With ``workers`` > 1 the pages are split into that many contiguous runs,
+    each extracted in its own process from its own copy of the PDF. Every
+    worker re-parses the file, so this only pays off on long documents.
+
     Returns
     -------
     [
@@ -25,53 +38,110 @@ def extract_chars_from_pdf(pdf_path: str) -> List[Dict[str, Any]]:
             "page_number": 1,          # 1-indexed
             "width": 612.0,
             "height": 792.0,
-            "chars": [ {text, x0, y0, x1, y1, fontname, size, ...}, ... ]
+            "chars": {"text": [...], "x0": array([...]), ...},  # CHAR_COLUMNS
         },
         ...
     ]
     """
-    pages_data: List[Dict[str, Any]] = []
-
-    with pdfplumber.open(pdf_path) as pdf:
-        for page in pdf.pages:
-            chars = page.chars  # list[dict]
-            cleaned: List[Dict[str, Any]] = []
-
-            for c in chars:
-                text = c.get("text", "")
-                if not text or text.isspace() and text != " ":
-                    continue
-                cleaned.append({
-                    "text": text,
-                    "x0": float(c["x0"]),
-                    "y0": float(c["top"]),
-                    "x1": float(c["x1"]),
-                    "y1": float(c["bottom"]),
-                    "fontname": c.get("fontname", ""),
-                    "size": round(float(c.get("size", 0)), 2),
-                    "color": _extract_color(c),
-                })
-
-            pages_data.append({
-                "page_number": page.page_number,  # already 1-indexed
-                "width": float(page.width),
-                "height": float(page.height),
-                "chars": cleaned,
-            })
-            logger.debug(
-                "Page %d: %d chars extracted (%.0f × %.0f pt)",
-                page.page_number, len(cleaned), page.width, page.height,
-            )
-
-    return pages_data
+    if workers > 1:
+        with pdfplumber.open(pdf_path) as pdf:
+            page_count = len(pdf.pages)
+        workers = min(workers, page_count)
+        if workers > 1:
+            step = -(-page_count // workers)
+            runs = [list(range(start + 1, min(start + step, page_count) + 1)) for start in range(0, page_count, step)]
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                # map() keeps the runs, and so the pages, in order
+                return [page for run in pool.map(_extract_pages, [pdf_path] * len(runs), runs) for page in run]
+
+    return _extract_pages(pdf_path)
+
+
+def _extract_pages(pdf_path: str, page_numbers: Optional[List[int]] = None) -> List[Dict[str, Any]]:
+    """Extract the given pages (1-indexed; all when None) of a PDF."""
+    with pdfplumber.open(pdf_path, pages=page_numbers) as pdf:
+        return [_extract_page(page) for page in pdf.pages]
+
+
+def _extract_page(page) -> Dict[str, Any]:
+    """Extract one pdfplumber page into a page dict with char columns."""
+    chars = page.chars  # list[dict]
+    n = len(chars)
+    x0, y0, x1, y1, size = (np.empty(n) for _ in NUMERIC_CHAR_COLUMNS)
+    texts: List[str] = []
+    fontnames: List[str] = []
+    colors: List[str] = []
+
+    k = 0
+    for c in chars:
+        text = c.get("text", "")
+        if not text or text.isspace() and text != " ":
+            continue
+        x0[k] = c["x0"]
+        y0[k] = c["top"]
+        x1[k] = c["x1"]
+        y1[k] = c["bottom"]
+        size[k] = round(float(c.get("size", 0)), 2)
+        texts.append(text)
+        fontnames.append(c.get("fontname", ""))
+        colors.append(_extract_color(c))
+        k += 1
+
+    page_data = {
+        "page_number": page.page_number,  # already 1-indexed
+        "width": float(page.width),
+        "height": float(page.height),
+        "chars": {
+            "text": texts,
+            "x0": x0[:k],
+            "y0": y0[:k],
+            "x1": x1[:k],
+            "y1": y1[:k],
+            "fontname": fontnames,
+            "size": size[:k],
+            "color": colors,
+        },
+    }
+    logger.debug(
+        "Page %d: %d chars extracted (%.0f × %.0f pt)",
+        page.page_number, k, page.width, page.height,
+    )
+    # Drop pdfplumber's cached layout objects for the page
+    page.close()
+    return page_data
+
+
+def char_columns(chars: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Convert a list of char dicts to the columnar form used per page."""
+    columns: Dict[str, Any] = {key: [c[key] for c in chars] for key in CHAR_COLUMNS}
+    for key in NUMERIC_CHAR_COLUMNS:
+        columns[key] = np.array(columns[key], dtype=np.float64)
+    return columns
+
+
+def iter_chars(chars: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """Yield one dict per char from a page's char columns."""
+    columns = [chars[key].tolist() if key in NUMERIC_CHAR_COLUMNS else chars[key] for key in CHAR_COLUMNS]
+    for values in zip(*columns):
+        yield dict(zip(CHAR_COLUMNS, values))
 
 
 def _extract_color(char_dict: Dict[str, Any]) -> str:
     """Best-effort extraction of text colour as hex string."""
     nsc = char_dict.get("non_stroking_color")
+    if isinstance(nsc, list):
+        nsc = tuple(nsc)
+    return _color_to_hex(nsc)
+
+
+# A document uses a handful of distinct colours across many thousands of
+# chars, so each colour value is converted once
+@lru_cache(maxsize=1024)
+def _color_to_hex(nsc: Any) -> str:
+    """Convert a pdfplumber non-stroking colour (gray, RGB or CMYK) to hex."""
     if nsc is None:
         return "#000000"
-    if isinstance(nsc, (list, tuple)):
+    if isinstance(nsc, tuple):
         if len(nsc) == 3:
             r, g, b = [int(max(0, min(1, v)) * 255) for v in nsc]
             return f"#{r:02x}{g:02x}{b:02x}"
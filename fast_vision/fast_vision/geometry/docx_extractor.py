@@ -55,11 +55,16 @@ def extract_from_docx(docx_path: str) -> Tuple[
     left_margin = 72.0  # ~1 inch
     text_width = page_w - 2 * left_margin
 
+    # python-docx objects by body element; doc.paragraphs / doc.tables build a
+    # fresh list on every access, so scanning them per element is quadratic
+    para_by_el = {para._element: para for para in doc.paragraphs}
+    tbl_by_el = {tbl._element: tbl for tbl in doc.tables}
+
     for element in doc.element.body:
         tag = element.tag.split("}")[-1]  # strip namespace
 
         if tag == "p":
-            para = _find_paragraph(doc, element)
+            para = para_by_el.get(element)
             if para is None:
                 continue
 
@@ -157,7 +162,7 @@ def extract_from_docx(docx_path: str) -> Tuple[
             y_cursor = bbox_y1 + font_size * 0.4  # paragraph spacing
 
         elif tag == "tbl":
-            tbl = _find_table(doc, element)
+            tbl = tbl_by_el.get(element)
             if tbl is None:
                 continue
 
@@ -235,22 +240,6 @@ def _emu_to_pt(emu_val) -> float:
     return float(emu_val) / 12700.0
 
 
-def _find_paragraph(doc, element):
-    """Find the python-docx Paragraph object for a given XML element."""
-    for para in doc.paragraphs:
-        if para._element is element:
-            return para
-    return None
-
-
-def _find_table(doc, element):
-    """Find the python-docx Table object for a given XML element."""
-    for tbl in doc.tables:
-        if tbl._element is element:
-            return tbl
-    return None
-
-
 def _full_paragraph_text(para) -> str:
     """Extract ALL text from a paragraph, including hyperlinks.
 
@@ -10,6 +10,8 @@ from __future__ import annotations
 import logging
 from typing import Any, Dict, List
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
 
@@ -24,32 +26,38 @@ def build_lines(words: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     if not words:
         return []
 
-    # Sort by vertical position first, then horizontal
-    sorted_words = sorted(words, key=lambda w: (w["y0"], w["x0"]))
-
-    lines: List[List[Dict[str, Any]]] = []
-    current_line: List[Dict[str, Any]] = [sorted_words[0]]
-
-    for w in sorted_words[1:]:
-        ref = current_line[0]
-        ref_mid_y = (ref["y0"] + ref["y1"]) / 2.0
-        w_mid_y = (w["y0"] + w["y1"]) / 2.0
-        tolerance = max(ref["size"] * 0.6, 3.0)
-
-        if abs(w_mid_y - ref_mid_y) <= tolerance:
-            current_line.append(w)
-        else:
-            lines.append(current_line)
-            current_line = [w]
-
-    if current_line:
-        lines.append(current_line)
-
+    n = len(words)
+    y0 = np.fromiter((w["y0"] for w in words), dtype=np.float64, count=n)
+    y1 = np.fromiter((w["y1"] for w in words), dtype=np.float64, count=n)
+    x0 = np.fromiter((w["x0"] for w in words), dtype=np.float64, count=n)
+    size = np.fromiter((w["size"] for w in words), dtype=np.float64, count=n)
+
+    # Sort by vertical position first, then horizontal (lexsort is stable,
+    # like sorted())
+    order = np.lexsort((x0, y0))
+    mid_y = ((y0 + y1) / 2.0)[order].tolist()
+    tolerance = np.maximum(size[order] * 0.6, 3.0).tolist()
+
+    # A word joins the current line if its centre is within the tolerance of
+    # the line's *first* word, so each break depends on the previous one and
+    # the scan stays sequential; it only compares plain floats.
+    starts = [0]
+    ref_mid_y, ref_tol = mid_y[0], tolerance[0]
+    for i in range(1, n):
+        if abs(mid_y[i] - ref_mid_y) > ref_tol:
+            starts.append(i)
+            ref_mid_y, ref_tol = mid_y[i], tolerance[i]
+
+    # Sort left-to-right within each line: one stable sort keyed by
+    # (line number, x0)
+    line_id = np.zeros(n, dtype=np.intp)
+    line_id[starts[1:]] = 1
+    order = order[np.lexsort((x0[order], np.cumsum(line_id)))].tolist()
+
+    starts.append(n)
     result: List[Dict[str, Any]] = []
-    for line_words in lines:
-        # Sort left-to-right within the line
-        line_words.sort(key=lambda w: w["x0"])
-        result.append(_merge_words(line_words))
+    for start, end in zip(starts, starts[1:]):
+        result.append(_merge_words([words[i] for i in order[start:end]]))
 
     logger.debug("Built %d lines from %d words", len(result), len(words))
     return result
@@ -57,27 +65,37 @@ def build_lines(words: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
 
 def _merge_words(words: List[Dict[str, Any]]) -> Dict[str, Any]:
     """Merge words into a single line dict."""
-    text = " ".join(w["text"] for w in words)
-
-    # Dominant font
+    # One pass for the text, bbox, dominant font and average size
+    first = words[0]
+    x0, y0, x1, y1 = first["x0"], first["y0"], first["x1"], first["y1"]
+    texts: List[str] = []
     font_counts: Dict[str, int] = {}
     size_sum = 0.0
     for w in words:
+        texts.append(w["text"])
         fn = w["fontname"]
         font_counts[fn] = font_counts.get(fn, 0) + 1
         size_sum += w["size"]
+        if w["x0"] < x0:
+            x0 = w["x0"]
+        if w["y0"] < y0:
+            y0 = w["y0"]
+        if w["x1"] > x1:
+            x1 = w["x1"]
+        if w["y1"] > y1:
+            y1 = w["y1"]
 
     dominant_font = max(font_counts, key=font_counts.get)  # type: ignore
     avg_size = round(size_sum / len(words), 2)
 
     return {
-        "text": text,
-        "x0": min(w["x0"] for w in words),
-        "y0": min(w["y0"] for w in words),
-        "x1": max(w["x1"] for w in words),
-        "y1": max(w["y1"] for w in words),
+        "text": " ".join(texts),
+        "x0": x0,
+        "y0": y0,
+        "x1": x1,
+        "y1": y1,
         "fontname": dominant_font,
         "size": avg_size,
-        "color": words[0]["color"],
+        "color": first["color"],
         "words": words,
     }
@@ -11,7 +11,9 @@ Algorithm:
 from __future__ import annotations
 
 import logging
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Union
+
+from fast_vision.geometry.char_extractor import char_columns
 
 logger = logging.getLogger(__name__)
 
@@ -19,77 +21,93 @@ logger = logging.getLogger(__name__)
 GAP_FACTOR = 0.35
 
 
-def build_words(chars: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+def build_words(chars: Union[Dict[str, Any], List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
     """Cluster characters into words.
 
     Parameters
     ----------
-    chars : list of char dicts with keys: text, x0, y0, x1, y1, fontname, size, color
+    chars : a page's char columns (see char_extractor), or a list of char dicts
+        with keys: text, x0, y0, x1, y1, fontname, size, color
 
     Returns
     -------
     list of word dicts:
         text, x0, y0, x1, y1, fontname, size, color
     """
-    if not chars:
+    if not isinstance(chars, dict):
+        chars = char_columns(chars)
+    text = chars["text"]
+    if not text:
         return []
 
+    fontname = chars["fontname"]
+    color = chars["color"]
+    x0, y0, x1, y1, size = (chars[key].tolist() for key in ("x0", "y0", "x1", "y1", "size"))
+
     # Sort top-to-bottom, then left-to-right
-    sorted_chars = sorted(chars, key=lambda c: (round(c["y0"], 1), c["x0"]))
+    order = sorted(range(len(text)), key=lambda i: (round(y0[i], 1), x0[i]))
 
     words: List[Dict[str, Any]] = []
-    current: List[Dict[str, Any]] = [sorted_chars[0]]
+    current: List[int] = [order[0]]
 
-    for c in sorted_chars[1:]:
+    for c in order[1:]:
         prev = current[-1]
 
         # Check vertical alignment — same baseline within tolerance
-        y_overlap = min(prev["y1"], c["y1"]) - max(prev["y0"], c["y0"])
-        min_height = min(prev["y1"] - prev["y0"], c["y1"] - c["y0"])
+        y_overlap = min(y1[prev], y1[c]) - max(y0[prev], y0[c])
+        min_height = min(y1[prev] - y0[prev], y1[c] - y0[c])
         same_line = y_overlap > 0 and (y_overlap / max(min_height, 0.1)) > 0.5
 
         if same_line:
-            gap = c["x0"] - prev["x1"]
-            avg_width = (prev["x1"] - prev["x0"] + c["x1"] - c["x0"]) / 2.0
-            threshold = max(avg_width * GAP_FACTOR, prev["size"] * 0.25)
+            gap = x0[c] - x1[prev]
+            avg_width = (x1[prev] - x0[prev] + x1[c] - x0[c]) / 2.0
+            threshold = max(avg_width * GAP_FACTOR, size[prev] * 0.25)
 
             if gap <= threshold:
                 current.append(c)
                 continue
 
         # Flush current word
-        words.append(_merge_chars(current))
+        words.append(_merge_chars(current, text, x0, y0, x1, y1, fontname, size, color))
         current = [c]
 
     if current:
-        words.append(_merge_chars(current))
+        words.append(_merge_chars(current, text, x0, y0, x1, y1, fontname, size, color))
 
-    logger.debug("Built %d words from %d chars", len(words), len(chars))
+    logger.debug("Built %d words from %d chars", len(words), len(text))
     return words
 
 
-def _merge_chars(chars: List[Dict[str, Any]]) -> Dict[str, Any]:
-    """Merge a run of chars into one word dict."""
-    text = "".join(c["text"] for c in chars)
-
+def _merge_chars(
+    idx: List[int],
+    text: List[str],
+    x0: List[float],
+    y0: List[float],
+    x1: List[float],
+    y1: List[float],
+    fontname: List[str],
+    size: List[float],
+    color: List[str],
+) -> Dict[str, Any]:
+    """Merge a run of chars (indices into the page columns) into one word dict."""
     # Dominant font = mode of fontnames
     font_counts: Dict[str, int] = {}
     size_sum = 0.0
-    for c in chars:
-        fn = c["fontname"]
+    for i in idx:
+        fn = fontname[i]
         font_counts[fn] = font_counts.get(fn, 0) + 1
-        size_sum += c["size"]
+        size_sum += size[i]
 
     dominant_font = max(font_counts, key=font_counts.get)  # type: ignore
-    avg_size = round(size_sum / len(chars), 2)
+    avg_size = round(size_sum / len(idx), 2)
 
     return {
-        "text": text,
-        "x0": min(c["x0"] for c in chars),
-        "y0": min(c["y0"] for c in chars),
-        "x1": max(c["x1"] for c in chars),
-        "y1": max(c["y1"] for c in chars),
+        "text": "".join([text[i] for i in idx]),
+        "x0": min([x0[i] for i in idx]),
+        "y0": min([y0[i] for i in idx]),
+        "x1": max([x1[i] for i in idx]),
+        "y1": max([y1[i] for i in idx]),
         "fontname": dominant_font,
         "size": avg_size,
-        "color": chars[0]["color"],
+        "color": color[idx[0]],
     }
@@ -45,6 +45,7 @@ def process_document(
     use_vision: bool = True,
     page_range: Optional[str] = None,
     progress_callback: Optional[Callable] = None,
+    workers: int = 1,
 ) -> LayoutDocument:
     """Auto-detect input format (PDF or DOCX) and extract structured JSON.
 
@@ -54,6 +55,7 @@ def process_document(
     use_vision : if True, call Gemini/OpenAI for semantic classification
     page_range : optional comma-separated page range (1-indexed), e.g. "1,3-5"
     progress_callback : optional callable(pct: float, msg: str)
+    workers : processes for PDF char extraction (1 = in-process)
 
     Returns
     -------
@@ -62,7 +64,7 @@ def process_document(
     ext = os.path.splitext(filepath)[1].lower()
 
     if ext == ".pdf":
-        return process_pdf(filepath, use_vision, page_range, progress_callback)
+        return process_pdf(filepath, use_vision, page_range, progress_callback, workers)
     elif ext in (".docx", ".doc"):
         return process_docx(filepath, use_vision, progress_callback)
     else:
@@ -264,13 +266,14 @@ def process_pdf(
     use_vision: bool = True,
     page_range: Optional[str] = None,
     progress_callback: Optional[Callable] = None,
+    workers: int = 1,
 ) -> LayoutDocument:
     """End-to-end PDF → LayoutDocument (Schema v3.0) pipeline."""
     doc_id = str(uuid.uuid4())
 
     # ─── Step 1: Extract chars ───────────────────────────────────────
     _progress(progress_callback, 0.05, "Extracting characters from PDF...")
-    pages_data = extract_chars_from_pdf(pdf_path)
+    pages_data = extract_chars_from_pdf(pdf_path, workers=workers)
 
     if page_range:
         pages_to_process = _parse_page_range(page_range, len(pages_data))
@@ -207,6 +207,80 @@ class TestWordBuilder:
         words = build_words(chars)
         assert len(words) >= 2  # "Hi " and "Wo" at minimum
 
+    def test_columnar_chars(self):
+        from fast_vision.geometry.char_extractor import char_columns, iter_chars
+        from fast_vision.geometry.word_builder import build_words
+
+        chars = [
+            {"text": "A", "x0": 10.0, "y0": 100.0, "x1": 18.0, "y1": 112.0, "fontname": "Arial", "size": 12.0, "color": "#000"},
+            {"text": "b", "x0": 18.0, "y0": 100.0, "x1": 24.0, "y1": 112.0, "fontname": "Arial", "size": 12.0, "color": "#000"},
+            {"text": "c", "x0": 50.0, "y0": 100.0, "x1": 56.0, "y1": 112.0, "fontname": "Arial", "size": 12.0, "color": "#000"},
+        ]
+        columns = char_columns(chars)
+        assert list(iter_chars(columns)) == chars
+        assert build_words(columns) == build_words(chars)
+        assert [w["text"] for w in build_words(columns)] == ["Ab", "c"]
+
+
+class TestCharExtractor:
+    """Char extraction on the sample PDF (if available)."""
+
+    SAMPLE_PDF = os.path.join(os.path.dirname(__file__), "..", "documents", "CompliancePolicy2018.pdf")
+
+    @pytest.mark.skipif(not os.path.exists(SAMPLE_PDF), reason="sample PDF not available")
+    def test_parallel_matches_serial(self):
+        from fast_vision.geometry.char_extractor import extract_chars_from_pdf, iter_chars
+
+        serial = extract_chars_from_pdf(self.SAMPLE_PDF)
+        parallel = extract_chars_from_pdf(self.SAMPLE_PDF, workers=3)
+        assert [p["page_number"] for p in parallel] == [p["page_number"] for p in serial]
+        for a, b in zip(serial, parallel):
+            assert list(iter_chars(a["chars"])) == list(iter_chars(b["chars"]))
+
+
+class TestLineBuilder:
+    """Unit test line builder with synthetic data."""
+
+    def test_lines_sorted_and_anchored(self):
+        from fast_vision.geometry.line_builder import build_lines
+
+        def word(text, x0, y0, size=10):
+            return {"text": text, "x0": x0, "y0": y0, "x1": x0 + 20, "y1": y0 + size,
+                    "fontname": "Arial", "size": size, "color": "#000"}
+
+        words = [
+            word("world", 40, 101),
+            word("next", 10, 130),
+            word("Hello", 10, 100),
+            # Within tolerance of "world" but not of the line's first word
+            word("drift", 70, 106.5),
+        ]
+        lines = build_lines(words)
+        assert [ln["text"] for ln in lines] == ["Hello world", "drift", "next"]
+        assert lines[0]["x0"] == 10 and lines[0]["x1"] == 60
+        assert [w["text"] for w in lines[0]["words"]] == ["Hello", "world"]
+
+
+class TestBlockBuilder:
+    """Unit test block builder with synthetic data."""
+
+    def test_block_breaks(self):
+        from fast_vision.geometry.block_builder import build_blocks
+
+        def line(text, y0, fontname="Arial", x0=72):
+            return {"text": text, "x0": x0, "y0": y0, "x1": x0 + 200, "y1": y0 + 10,
+                    "fontname": fontname, "size": 10, "color": "#000", "words": []}
+
+        lines = [
+            line("para one b", 112, "Arial-Bold"),
+            line("para one a", 100),
+            line("after gap", 150),
+            line("other font", 162, "Times"),
+            line("shifted", 174, "Times", x0=200),
+        ]
+        blocks = build_blocks(lines)
+        assert [b["text"] for b in blocks] == ["para one a\npara one b", "after gap", "other font", "shifted"]
+
 
 class TestStyleNormalizer:
     """Unit test style normalizer."""